@@ -1,14 +1,12 @@
-import fcntl
-import json
 import logging
 import os
 import select
-import shutil
 import subprocess
 import sys
-import tempfile
+import threading
 import time
 
+import orjson
 import pytest
 
 log = logging.getLogger(__name__)
@@ -19,6 +17,9 @@ SERVER_SCRIPT_PATH = os.path.join(
     "vector_index_mcp",
     "main_mcp.py",
 )
+# Upper bound on server startup (loading the embedding model dominates it)
+SERVER_READY_TIMEOUT = 60
+READINESS_PROBE_ID = "readiness-probe"
 
 
 def start_server_process(env_vars):
@@ -39,16 +40,61 @@ def start_server_process(env_vars):
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         env=process_env,
-        text=True,
-        bufsize=1,
-    )
-    # The initial sleep is a blunt instrument, but necessary to give the server
-    # process time to start up and be ready to receive requests. A more
-    # sophisticated approach would involve a health check loop.
-    time.sleep(5)
+    )  # Binary pipes: stdout is only read through its raw file descriptor
+    proc.stderr_ready = threading.Condition()
+    proc.stderr_chunks = []
+    proc.stderr_closed = False
+    threading.Thread(target=_drain_stderr, args=(proc,), daemon=True).start()
+    wait_until_ready(proc)
     return proc
 
 
+def _drain_stderr(process):
+    """
+    Runs on a daemon thread for the lifetime of the server, moving its stderr into
+    `process.stderr_chunks` as it is written. The server logs at DEBUG level, so
+    a server shared by several tests would otherwise block once the pipe filled.
+    """
+    fd = process.stderr.fileno()
+    while chunk := os.read(fd, 65536):
+        with process.stderr_ready:
+            process.stderr_chunks.append(chunk)
+            process.stderr_ready.notify_all()
+    with process.stderr_ready:
+        process.stderr_closed = True
+        process.stderr_ready.notify_all()
+
+
+def wait_until_ready(process, timeout=SERVER_READY_TIMEOUT):
+    """
+    Blocks until the server answers a JSON-RPC ping, i.e. until its lifespan has
+    finished and it is processing requests. Ping is the one request MCP allows
+    before `initialize`, so the tests' own handshake is unaffected. A single ping
+    is sent: it waits in the stdin pipe until the server reads it, and retrying
+    would only queue duplicate responses.
+    """
+    send_mcp_request(process, "ping", request_id=READINESS_PROBE_ID)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"Server process exited during startup with code {process.returncode}. Stderr: {read_stderr(process)}"
+            )
+        try:
+            # Short waits, so a crashed server is noticed promptly
+            line = _read_stdout_line(process, timeout=0.1)
+        except TimeoutError:
+            continue
+        if not line:
+            process.wait(timeout=5)  # stdout reached EOF: the server is exiting
+            continue
+        if orjson.loads(line).get("id") == READINESS_PROBE_ID:
+            return
+    raise TimeoutError(
+        f"Server did not answer a ping within {timeout}s. Stderr: {read_stderr(process)}"
+    )
+
+
 def send_mcp_request(process, method, params=None, request_id=1):
     """Constructs and sends a JSON-RPC request to the process."""
     request_obj = {
@@ -67,59 +113,50 @@ def send_mcp_request(process, method, params=None, request_id=1):
     elif params:
         request_obj["params"] = params
 
-    request_str = json.dumps(request_obj) + "\n"
+    request_bytes = orjson.dumps(request_obj) + b"\n"
 
     if process.stdin is None:
         raise BrokenPipeError("Stdin is not available")
 
-    process.stdin.write(request_str)
+    process.stdin.write(request_bytes)
     process.stdin.flush()
 
 
+def _read_stdout_line(process, timeout):
+    """
+    Returns the server's next stdout line (without the newline), waiting at most
+    `timeout` seconds for it, or b"" at EOF. The raw file descriptor is read in
+    64 KiB chunks; bytes past the line stay in a buffer on the process object for
+    the next call, so a large response costs a few reads instead of a
+    per-line scan through a text wrapper.
+    """
+    buffer = process.__dict__.setdefault("stdout_buffer", bytearray())
+    fd = process.stdout.fileno()
+    deadline = time.monotonic() + timeout
+    while (line_end := buffer.find(b"\n")) < 0:
+        ready_to_read, _, _ = select.select(
+            [fd], [], [], max(0.0, deadline - time.monotonic())
+        )
+        if not ready_to_read:
+            raise TimeoutError
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b""
+        buffer += chunk
+    line = bytes(buffer[:line_end])
+    del buffer[: line_end + 1]
+    return line
+
+
 def read_mcp_response(process, timeout=20):
-    """Reads and parses a JSON-RPC response from the process using select for timeout."""
+    """Reads and parses the next JSON-RPC response from the process, waiting at most `timeout` seconds."""
     if process.stdout is None:
         log.error("process.stdout is None, cannot read response.")
         raise BrokenPipeError("Stdout is not available")
 
-    if not hasattr(process.stdout, "fileno"):
-        log.error("process.stdout does not have a fileno method, cannot use select.")
-        raise ValueError(
-            "process.stdout does not have a fileno method, cannot use select."
-        )
-
-    stdout_fd = -1
     try:
-        stdout_fd = process.stdout.fileno()
-    except ValueError as e:
-        stderr_output = read_stderr(process)
-        log.error(
-            f"Failed to get fileno from process.stdout. It might be closed. Error: {e}. Stderr: {stderr_output}"
-        )
-        raise BrokenPipeError(
-            f"Failed to get fileno from process.stdout (it might be closed): {e}. Stderr: {stderr_output}"
-        ) from e
-
-    try:
-        ready_to_read, _, _ = select.select([stdout_fd], [], [], timeout)
-    except ValueError as e:
-        stderr_output = read_stderr(process)
-        log.error(
-            f"select.select error on stdout (fd: {stdout_fd}): {e}. Process poll: {process.poll()}. Stderr: {stderr_output}"
-        )
-        raise BrokenPipeError(
-            f"select.select error on stdout (fd: {stdout_fd}, possibly closed): {e}. Stderr: {stderr_output}"
-        ) from e
-    except Exception as e:
-        stderr_output = read_stderr(process)
-        log.error(
-            f"Unexpected error during select.select on stdout (fd: {stdout_fd}): {e}. Stderr: {stderr_output}"
-        )
-        raise RuntimeError(
-            f"Unexpected error during select.select: {e}. Stderr: {stderr_output}"
-        ) from e
-
-    if not ready_to_read:
+        response_bytes = _read_stdout_line(process, timeout)
+    except TimeoutError:
         stderr_output = read_stderr(process)
         log.warning(
             f"Timeout ({timeout}s) reading from server stdout. Stderr: {stderr_output}"
@@ -127,20 +164,16 @@ def read_mcp_response(process, timeout=20):
         raise TimeoutError(
             f"Timeout ({timeout}s) reading from server stdout. Stderr: {stderr_output}"
         )
-
-    response_str = ""
-    try:
-        response_str = process.stdout.readline()
-    except ValueError as e:
+    except (OSError, ValueError) as e:
         stderr_output = read_stderr(process)
         log.error(
-            f"Error reading line from stdout after select indicated readiness (fd: {stdout_fd}): {e}. Stderr: {stderr_output}"
+            f"Error reading from server stdout (it might be closed): {e}. Process poll: {process.poll()}. Stderr: {stderr_output}"
         )
-        raise EOFError(
-            f"Error reading line from stdout (it might be closed): {e}. Stderr: {stderr_output}"
+        raise BrokenPipeError(
+            f"Error reading from server stdout (it might be closed): {e}. Stderr: {stderr_output}"
         ) from e
 
-    if not response_str:
+    if not response_bytes:
         stderr_output = read_stderr(process)
         log.warning(
             f"No response received from server (EOF or empty line read from stdout). Stderr: {stderr_output}"
@@ -149,17 +182,18 @@ def read_mcp_response(process, timeout=20):
             f"No response received from server (EOF or empty line read from stdout). Stderr: {stderr_output}"
         )
 
+    response_str = response_bytes.decode("utf-8", errors="replace")
     log.debug(f"Raw response string from server: '{response_str.strip()}'")
 
     try:
-        response_data = json.loads(response_str)
+        response_data = orjson.loads(response_bytes)
         log.debug(f"Successfully parsed MCP Response: {response_data}")
         return response_data
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         log.error(
             f"Failed to decode JSON response: '{response_str.strip()}'. Error: {e}"
         )
-        raise json.JSONDecodeError(
+        raise orjson.JSONDecodeError(
             f"Failed to decode JSON response: '{response_str.strip()}'. Original error: {e}. Stderr: {read_stderr(process)}",
             e.doc,
             e.pos,
@@ -168,46 +202,27 @@ def read_mcp_response(process, timeout=20):
 
 def read_stderr(process, timeout=1.0):
     """
-    Reads all available lines from the process's stderr without blocking.
-    Uses select to check for readability and reads until the buffer is empty.
+    Returns what the process has written to stderr since the previous call,
+    waiting at most `timeout` seconds for new output if there is none yet.
     """
     if process.stderr is None:
         return "Stderr not available"
 
-    output = []
-    # Set the stream to non-blocking
-    fd = process.stderr.fileno()
-    fl = fcntl.fcntl(fd, fcntl.F_GETFL)
-    fcntl.fcntl(fd, fcntl.F_SETFL, fl | os.O_NONBLOCK)
-
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            line = process.stderr.readline()
-            if line:
-                output.append(line)
-            else:
-                # No more data, sleep a bit
-                time.sleep(0.1)
-        except BlockingIOError:
-            # No data available, wait a bit
-            time.sleep(0.1)
-            continue
-        except ValueError:
-            # Pipe closed
-            break
-
-    return "".join(output)
+    with process.stderr_ready:
+        process.stderr_ready.wait_for(
+            lambda: process.stderr_chunks or process.stderr_closed, timeout
+        )
+        chunks, process.stderr_chunks = process.stderr_chunks, []
+    return b"".join(chunks).decode(errors="replace")
 
 
 @pytest.fixture(scope="function")
-def temp_project_dir():
+def temp_project_dir(tmp_path):
     """Creates a temporary directory for testing project path."""
-    temp_dir = tempfile.mkdtemp(prefix="test_project_")
-    with open(os.path.join(temp_dir, "dummy.txt"), "w") as f:
-        f.write("test content")
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+    project_dir = tmp_path / "test_project"
+    project_dir.mkdir()
+    (project_dir / "dummy.txt").write_text("test content")
+    return str(project_dir)
 
 
 @pytest.fixture(scope="function")
@@ -217,16 +232,15 @@ def temp_lancedb_uri(temp_project_dir):
     return db_path
 
 
-@pytest.fixture(scope="function")
-def server_process(temp_project_dir, temp_lancedb_uri):
-    """Fixture to start and stop the MCP server process for each test function."""
+def _run_server(project_dir, lancedb_uri):
+    """Starts the MCP server for `project_dir`, yields it, and stops it afterwards."""
     env_vars = {
-        "PROJECT_PATH": temp_project_dir,
-        "LANCEDB_URI": temp_lancedb_uri,
+        "PROJECT_PATH": project_dir,
+        "LANCEDB_URI": lancedb_uri,
         "LOG_LEVEL": "DEBUG",
-        "IGNORE_PATTERNS": json.dumps(
+        "IGNORE_PATTERNS": orjson.dumps(
             [".*", "*.db", "*.sqlite", "*.log", "node_modules/*", "venv/*", ".git/*"]
-        ),
+        ).decode(),
         "TESTING_MODE": "true",
         "HF_HUB_OFFLINE": "1",  # Prevent HuggingFace Hub network calls
     }
@@ -258,3 +272,37 @@ def server_process(temp_project_dir, temp_lancedb_uri):
     stderr_output = read_stderr(proc, timeout=1)
     if stderr_output:
         print(f"Server stderr during teardown:\n{stderr_output}")
+
+
+@pytest.fixture(scope="function")
+def server_process(temp_project_dir, temp_lancedb_uri):
+    """Fixture to start and stop the MCP server process for each test function."""
+    yield from _run_server(temp_project_dir, temp_lancedb_uri)
+
+
+@pytest.fixture(scope="module")
+def module_server_process(tmp_path_factory):
+    """
+    One MCP server process shared by the tests of a module, for tests that only
+    inspect the server and do not depend on a freshly created index.
+    """
+    project_dir = tmp_path_factory.mktemp("test_project")
+    (project_dir / "dummy.txt").write_text("test content")
+    yield from _run_server(str(project_dir), str(project_dir / ".lancedb"))
+
+
+@pytest.fixture(scope="module")
+def initialized_server(module_server_process):
+    """
+    Completes the MCP handshake once on the module's shared server and returns
+    `(process, initialize_response)`.
+    """
+    send_mcp_request(module_server_process, "initialize", request_id="init")
+    init_response = read_mcp_response(module_server_process)
+    assert "result" in init_response, (
+        f"Error in init response: {init_response.get('error')}"
+    )
+    send_mcp_request(
+        module_server_process, "notifications/initialized", request_id=None
+    )
+    return module_server_process, init_response
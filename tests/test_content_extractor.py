@@ -0,0 +1,28 @@
+import pytest
+
+from vector_index_mcp.content_extractor import (
+    chunk_content,
+    hash_chunk,
+    stream_chunks,
+)
+
+
+@pytest.mark.parametrize("length", [0, 1, 100, 2047, 2048, 2049, 10_000])
+@pytest.mark.parametrize("chunk_size, overlap", [(512, 128), (64, 0), (16, 15)])
+def test_stream_chunks_count_matches_chunks(length, chunk_size, overlap):
+    content = "".join(f"word{i % 97} " for i in range(length))[:length]
+    count, chunks = stream_chunks(content, chunk_size, overlap)
+    chunks = list(chunks)
+    assert count == len(chunks)
+    assert chunks == chunk_content(content, chunk_size, overlap)
+    assert bool(chunks) == bool(content)
+
+
+def test_stream_chunks_rejects_overlap_not_smaller_than_chunk_size():
+    with pytest.raises(ValueError):
+        stream_chunks("some text", chunk_size=8, overlap=8)
+
+
+def test_hash_chunk_is_stable_and_content_sensitive():
+    assert hash_chunk("def main(): pass") == hash_chunk("def main(): pass")
+    assert hash_chunk("def main(): pass") != hash_chunk("def main(): return")
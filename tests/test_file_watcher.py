@@ -0,0 +1,303 @@
+import asyncio
+import json
+import os
+import threading
+
+import pathspec
+import pytest
+from watchdog.events import FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+from watchdog.observers.polling import PollingObserver
+
+from vector_index_mcp import file_watcher
+from vector_index_mcp.content_extractor import chunk_content
+from vector_index_mcp.file_watcher import KNOWN_FILES_FILENAME, FileWatcher
+
+
+class FakeIndexer:
+    """Records the indexer calls made by the FileWatcher instead of embedding anything."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.write_failures = 0
+        self.added = []  # (file_path, chunk_index) of buffered chunks
+        self.updates = []  # (file_path, changed chunk indices, total_chunks)
+        self.removed = []
+        self._buffer = []
+
+    async def add_or_update_documents(self, docs):
+        self._buffer.extend(docs)
+
+    async def flush(self):
+        buffer, self._buffer = self._buffer, []
+        if buffer and self.fail:
+            self.write_failures += 1
+            raise RuntimeError("write failed")
+        self.added.extend((doc.file_path, doc.chunk_index) for doc in buffer)
+
+    async def update_document_chunks(
+        self, file_path, changed_docs, total_chunks, content_hash, last_modified
+    ):
+        if self.fail:
+            raise RuntimeError("update failed")
+        self.updates.append(
+            (file_path, [doc.chunk_index for doc in changed_docs], total_chunks)
+        )
+
+    async def remove_document(self, file_path):
+        self.removed.append(file_path)
+        return not self.fail
+
+
+@pytest.fixture
+def event_loop_thread():
+    """An event loop running in a background thread, as the server's loop does for the watcher."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    return project
+
+
+def make_watcher(project_dir, indexer, loop, ignore_patterns=None, fresh=True):
+    watcher = FileWatcher(
+        project_path=str(project_dir),
+        indexer=indexer,
+        event_loop=loop,
+        ignore_patterns=ignore_patterns,
+        abs_lancedb_path_to_ignore=str(project_dir / ".lancedb"),
+        scan_workers=2,
+        debounce_period=0.01,
+    )
+    if fresh:
+        watcher.reset_known_files()
+    return watcher
+
+
+def test_coalesce_rules():
+    assert FileWatcher._coalesce("deleted", "created") == "modified"
+    assert FileWatcher._coalesce("created", "modified") == "created"
+    assert FileWatcher._coalesce("modified", "deleted") == "deleted"
+    assert FileWatcher._coalesce(None, "modified") == "modified"
+
+
+def test_collect_batch_coalesces_events_per_path(project_dir):
+    watcher = make_watcher(project_dir, None, None)
+    for event in [
+        ("created", "a.py"),
+        ("modified", "a.py"),
+        ("deleted", "b.py"),
+        ("created", "b.py"),
+        ("modified", "c.py"),
+        ("deleted", "c.py"),
+    ]:
+        watcher.event_queue.put(event)
+
+    assert watcher._collect_batch() == {
+        "a.py": "created",
+        "b.py": "modified",
+        "c.py": "deleted",
+    }
+    watcher.event_queue.put(None)
+    assert watcher._collect_batch() is None
+
+
+def test_modified_file_only_reembeds_changed_chunks(project_dir, event_loop_thread):
+    lines = [f"line {i}: " + "lorem ipsum dolor sit amet " * 4 for i in range(300)]
+    file_path = project_dir / "module.py"
+    file_path.write_text("\n".join(lines))
+    indexer = FakeIndexer()
+    watcher = make_watcher(project_dir, indexer, event_loop_thread)
+
+    watcher.initial_scan()
+    old_chunks = chunk_content(file_path.read_text())
+    assert len(old_chunks) > 3
+    assert sorted(indexer.added) == [
+        (str(file_path), i) for i in range(len(old_chunks))
+    ]
+
+    lines[-1] = "the last line changed"
+    file_path.write_text("\n".join(lines))
+    watcher.process_modification(str(file_path))
+    watcher.wait_for_indexing()
+
+    new_chunks = chunk_content(file_path.read_text())
+    changed = [
+        i
+        for i, chunk in enumerate(new_chunks)
+        if i >= len(old_chunks) or chunk != old_chunks[i]
+    ]
+    assert 0 < len(changed) < len(new_chunks)
+    assert indexer.updates == [(str(file_path), changed, len(new_chunks))]
+    assert len(watcher.known_files[str(file_path)]["chunk_hashes"]) == len(new_chunks)
+
+
+def test_unknown_file_is_upserted_unless_index_is_fresh(project_dir, event_loop_thread):
+    file_path = project_dir / "module.py"
+    file_path.write_text("print('hello')\n")
+    indexer = FakeIndexer()
+    watcher = make_watcher(project_dir, indexer, event_loop_thread, fresh=False)
+
+    watcher.initial_scan()
+
+    # The file may have rows from a run whose known_files were lost
+    assert indexer.added == []
+    assert indexer.updates == [(str(file_path), [0], 1)]
+
+
+def test_failed_indexing_is_not_recorded_as_indexed(project_dir, event_loop_thread):
+    file_path = project_dir / "module.py"
+    file_path.write_text("print('hello')\n")
+    watcher = make_watcher(project_dir, FakeIndexer(fail=True), event_loop_thread)
+
+    watcher.initial_scan()
+    assert watcher.known_files[str(file_path)]["hash"] == ""
+
+    # After a restart, the file is retried instead of being skipped
+    indexer = FakeIndexer()
+    watcher = make_watcher(project_dir, indexer, event_loop_thread, fresh=False)
+    watcher.initial_scan()
+    assert indexer.updates == [(str(file_path), [0], 1)]
+    assert watcher.known_files[str(file_path)]["hash"] != ""
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["*.log", "build/", "node_modules", "docs/**/*.tmp", "/root_only.txt"],
+        ["*.log", "!keep.log", "build/"],
+    ],
+)
+def test_ignore_matching_agrees_with_pathspec(project_dir, patterns):
+    watcher = make_watcher(project_dir, None, None, ignore_patterns=list(patterns))
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+    has_negation = any(pattern.startswith("!") for pattern in patterns)
+    assert (watcher._ignore_regex is None) == has_negation
+
+    rel_paths = [
+        "app.log",
+        "keep.log",
+        "src/app.log",
+        "build/out.js",
+        "src/build/out.js",
+        "build",
+        "node_modules/pkg/index.js",
+        "docs/a/b/c.tmp",
+        "docs/c.md",
+        "root_only.txt",
+        "src/root_only.txt",
+        "src/main.py",
+    ]
+    for rel_path in rel_paths:
+        expected = spec.match_file(rel_path)
+        assert watcher._match_file(rel_path) == expected, rel_path
+        absolute_path = os.path.join(str(project_dir), rel_path)
+        assert watcher._should_ignore(absolute_path) == expected, rel_path
+
+
+def test_lancedb_directory_and_outside_paths_are_ignored(project_dir):
+    watcher = make_watcher(project_dir, None, None)
+    assert watcher._should_ignore(str(project_dir / ".lancedb" / "data.lance"))
+    assert watcher._should_ignore(str(project_dir.parent / "other.py"))
+    assert not watcher._should_ignore(str(project_dir / "main.py"))
+
+
+def test_known_files_are_saved_loaded_and_reset(project_dir, event_loop_thread):
+    file_path = project_dir / "module.py"
+    file_path.write_text("print('hello')\n")
+    watcher = make_watcher(project_dir, FakeIndexer(), event_loop_thread)
+    watcher.initial_scan()
+    watcher.stop()
+
+    known_files_path = project_dir / ".lancedb" / KNOWN_FILES_FILENAME
+    saved = json.loads(known_files_path.read_text())
+    assert saved == watcher.known_files
+    assert saved[str(file_path)]["size"] == file_path.stat().st_size
+
+    # A restart loads the saved state and skips the unchanged file
+    indexer = FakeIndexer()
+    restarted = make_watcher(project_dir, indexer, event_loop_thread, fresh=False)
+    assert restarted.known_files == saved
+    restarted.initial_scan()
+    assert indexer.added == [] and indexer.updates == []
+
+    restarted.reset_known_files()
+    assert restarted.known_files == {}
+
+
+def test_corrupt_known_files_are_ignored(project_dir):
+    lancedb_dir = project_dir / ".lancedb"
+    lancedb_dir.mkdir()
+    (lancedb_dir / KNOWN_FILES_FILENAME).write_text("{not json")
+    watcher = make_watcher(project_dir, None, None, fresh=False)
+    assert watcher.known_files == {}
+
+
+def test_stopped_watcher_aborts_initial_scan(project_dir, event_loop_thread):
+    (project_dir / "module.py").write_text("print('hello')\n")
+    indexer = FakeIndexer()
+    watcher = make_watcher(project_dir, indexer, event_loop_thread)
+
+    watcher.stop()
+    watcher.initial_scan()
+
+    assert indexer.added == [] and indexer.updates == []
+
+
+def test_observer_backend_selection(project_dir, monkeypatch):
+    watcher = make_watcher(project_dir, None, None)
+    assert not isinstance(watcher.observer, PollingObserver)
+
+    polling = FileWatcher(str(project_dir), None, None, observer_backend="polling")
+    assert isinstance(polling.observer, PollingObserver)
+
+    monkeypatch.setattr(file_watcher, "_filesystem_type", lambda path: "nfs4")
+    assert isinstance(make_watcher(project_dir, None, None).observer, PollingObserver)
+
+    with pytest.raises(ValueError):
+        FileWatcher(str(project_dir), None, None, observer_backend="fsevents")
+
+
+def test_events_for_ignored_files_are_not_queued(project_dir):
+    watcher = make_watcher(project_dir, None, None, ignore_patterns=["build/"])
+    lancedb_file = str(project_dir / ".lancedb" / "documents.lance" / "data.lance")
+    watcher.dispatch(FileModifiedEvent(lancedb_file))
+    watcher.dispatch(FileCreatedEvent(str(project_dir / "build" / "out.js")))
+    watcher.dispatch(
+        FileMovedEvent(
+            str(project_dir / "build" / "tmp.py"), str(project_dir / "main.py")
+        )
+    )
+
+    # A move out of an ignored directory still indexes its destination
+    assert watcher._collect_batch() == {
+        str(project_dir / "build" / "tmp.py"): "deleted",
+        str(project_dir / "main.py"): "created",
+    }
+
+
+def test_initial_scan_counts_scanned_files(project_dir, event_loop_thread, monkeypatch):
+    # Batches smaller than the tree exercise the streamed walk
+    monkeypatch.setattr(file_watcher, "SCAN_BATCH_SIZE", 3)
+    for i in range(10):
+        (project_dir / f"module_{i}.py").write_text(f"print({i})\n")
+    (project_dir / "debug.log").write_text("ignored\n")
+    indexer = FakeIndexer()
+    watcher = make_watcher(
+        project_dir, indexer, event_loop_thread, ignore_patterns=["*.log"]
+    )
+
+    watcher.initial_scan()
+
+    assert watcher.files_scanned == 10
+    assert sorted(path for path, _ in indexer.added) == sorted(
+        str(project_dir / f"module_{i}.py") for i in range(10)
+    )
@@ -7,21 +7,18 @@ from .conftest import read_mcp_response, read_stderr, send_mcp_request
 # No need to import helper functions or fixtures directly, pytest handles conftest.py
 
 
-def test_initialize(server_process):
+def test_initialize(initialized_server):
     """
     Test the Initialize request.
     Verifies that the server responds with its name, version, and capabilities.
     """
-    send_mcp_request(server_process, "initialize", request_id="init_test_1")
-    response = read_mcp_response(server_process)
+    _, response = initialized_server
 
     assert response["jsonrpc"] == "2.0"
-    assert response["id"] == "init_test_1"
+    assert response["id"] == "init"
     assert "result" in response, f"Error in response: {response.get('error')}"
     assert "error" not in response
 
-    send_mcp_request(server_process, "notifications/initialized", request_id=None)
-
     result = response["result"]
     assert "serverInfo" in result, "serverInfo missing from initialize response result"
     server_info = result["serverInfo"]
@@ -37,16 +34,12 @@ def test_initialize(server_process):
     assert "resources" in capabilities
 
 
-def test_indexing_triggered_on_startup(server_process):
+def test_indexing_triggered_on_startup(initialized_server):
     """
     Test that project indexing is automatically triggered when the MCP server starts.
     This is verified by checking for a specific log message in the server's stderr.
     """
-    # The server starts via the fixture. We send initialize and initialized
-    # to complete the handshake and trigger the server's startup logic.
-    send_mcp_request(server_process, "initialize", request_id="init_test_1")
-    read_mcp_response(server_process)
-    send_mcp_request(server_process, "notifications/initialized", request_id=None)
+    server_process, _ = initialized_server
 
     # Reliably wait for the target log message to appear in stderr.
     max_wait_time = 30  # seconds
@@ -70,19 +63,13 @@ def test_indexing_triggered_on_startup(server_process):
     assert "Triggering initial project file scan on server startup..." in stderr_output
 
 
-def test_list_tools(server_process):
+def test_list_tools(initialized_server):
     """
     Test the ListTools request.
     Verifies that the server returns the expected list of tools
     with their names, descriptions, and input schemas.
     """
-    send_mcp_request(server_process, "initialize", request_id="init_list_tools")
-    init_response = read_mcp_response(server_process)
-    assert "result" in init_response, (
-        f"Error in init response: {init_response.get('error')}"
-    )
-    send_mcp_request(server_process, "notifications/initialized", request_id=None)
-
+    server_process, _ = initialized_server
     send_mcp_request(server_process, "tools/list", request_id="list_tools_test_1")
     response = read_mcp_response(server_process)
 
@@ -96,7 +83,12 @@ def test_list_tools(server_process):
     tools_list = tools_payload["tools"]
     assert isinstance(tools_list, list)
 
-    expected_tool_names = {"trigger_index", "get_status", "search_index"}
+    expected_tool_names = {
+        "trigger_index",
+        "get_status",
+        "search_index",
+        "search_index_batch",
+    }
     found_tool_names = {tool["name"] for tool in tools_list}
     assert found_tool_names == expected_tool_names
 
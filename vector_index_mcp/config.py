@@ -1,32 +1,137 @@
 # vector_index_mcp/config.py
+import functools
+import json
 import os
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import Field, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    """
+    Configuration settings for the vector index MCP server. Each field is read
+    from the environment variable of the same name (case-insensitive), e.g.
+    SCAN_WORKERS for `scan_workers`, or from a `.env` file in the working
+    directory, unless passed explicitly.
+    """
+
     _env_file_value = None if os.getenv("TESTING_MODE") == "true" else ".env"
     model_config = SettingsConfigDict(
         env_file=_env_file_value, env_file_encoding="utf-8", extra="ignore"
     )
 
-    project_path: str = os.getcwd()
-    lancedb_uri: str = ".lancedb"
-    embedding_model_name: str = "all-MiniLM-L6-v2"
-    log_level: str = "INFO"
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
-    ignore_patterns: List[str] = [
-        ".*",
-        "*.db",
-        "*.sqlite",
-        "*.log",
-        "node_modules/*",
-        "venv/*",
-        ".git/*",
-    ]
-    watch_delay: float = 1.0  # seconds
-    debounce_period: float = 0.5  # seconds
+    embedding_model_name: str = Field(
+        default="all-MiniLM-L6-v2",
+        description="Name of the sentence-transformer model to use for embeddings.",
+    )
+    lancedb_uri: str = Field(
+        default="./.lancedb",
+        description="URI for the LanceDB database. Can be a local path or remote.",
+    )
+    log_level: str = Field(
+        default="INFO",
+        description="Logging level for the application (e.g., DEBUG, INFO, WARNING, ERROR).",
+    )
+    project_path: str = Field(
+        default_factory=os.getcwd
+    )  # Typically passed as a CLI argument.
+    ignore_patterns: Annotated[List[str], NoDecode] = Field(
+        default=[".git", "__pycache__", "*.pyc", "*.DS_Store", ".DS_Store"],
+        description="Comma-separated list of .gitignore-style patterns for files/directories to ignore.",
+    )
+    embedding_batch_size: int = Field(
+        default=64,
+        ge=1,
+        description="Number of text chunks the embedding model encodes per forward pass.",
+    )
+    scan_workers: int = Field(
+        default_factory=lambda: min(32, (os.cpu_count() or 1) * 2),
+        ge=1,
+        description="Number of threads used to hash and chunk files during a project scan.",
+    )
+    debounce_period: float = Field(
+        default=0.5,
+        ge=0,
+        description="Seconds without further file events before queued events are coalesced per path and processed.",
+    )
+    watcher_backend: Literal["auto", "native", "polling"] = Field(
+        default="auto",
+        description="File watcher backend: 'native' (inotify on Linux), 'polling', or 'auto' to poll only on network filesystems.",
+    )
+    polling_interval: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds between tree scans when the polling file watcher backend is used.",
+    )
+    embedding_cache: bool = Field(
+        default=True,
+        description="Keep computed embeddings in a LanceDB side table keyed by model and chunk text, so identical chunks are never embedded twice.",
+    )
+    search_cache_size: int = Field(
+        default=512,
+        ge=0,
+        description="Maximum number of search results kept in the in-memory search cache. 0 disables the cache.",
+    )
+    search_cache_ttl: float = Field(
+        default=60.0,
+        ge=0,
+        description="Seconds a cached search result stays valid, unless the index changes first.",
+    )
+    search_similarity_threshold: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="If set, a query whose embedding has at least this cosine similarity (less a 1e-5 rounding tolerance) with a cached query's reuses its search results. Unset disables this; 1 only matches identical embeddings.",
+    )
+    embedding_threads: int = Field(
+        default=2,
+        ge=1,
+        description="Number of threads that run embedding model calls, off the event loop.",
+    )
+    embedding_compile: bool = Field(
+        default=False,
+        description="Compile the embedding model's transformer with torch.compile at startup. Slower startup, faster encoding.",
+    )
+    fast_hash_large_files: bool = Field(
+        default=True,
+        description="Fingerprint files above fast_hash_threshold from their size and first/last 1 MiB instead of hashing them in full.",
+    )
+    fast_hash_threshold: int = Field(
+        default=32 << 20,
+        ge=2 << 20,
+        description="File size in bytes above which the fast fingerprint is used.",
+    )
+
+    @field_validator("ignore_patterns", mode="before")
+    @classmethod
+    def split_ignore_patterns(cls, value):
+        if isinstance(value, str):
+            if value.lstrip().startswith("["):
+                return json.loads(
+                    value
+                )  # A JSON list, as pydantic-settings reads lists
+            # Ensure no empty strings from multiple commas
+            return [p.strip() for p in value.split(",") if p.strip()]
+        return value
+
+    @field_validator("log_level")
+    @classmethod
+    def validate_log_level(cls, value):
+        allowed_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        if value.upper() not in allowed_levels:
+            raise ValueError(
+                f"Invalid log_level: {value}. Must be one of {allowed_levels}"
+            )
+        return value.upper()
+
+    @model_validator(mode="after")
+    def resolve_paths(self):
+        self.project_path = os.path.abspath(self.project_path)
+        # A relative local LanceDB path is relative to the project, not the working directory
+        if "://" not in self.lancedb_uri and not os.path.isabs(self.lancedb_uri):
+            self.lancedb_uri = os.path.join(self.project_path, self.lancedb_uri)
+        return self
 
     @property
     def embedding_dim(self) -> int:
@@ -42,38 +147,7 @@ class Settings(BaseSettings):
         )
 
 
-_settings_instance = None
-
-
+@functools.lru_cache(maxsize=None)
 def get_vector_index_settings() -> Settings:
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = Settings()
-
-        env_project_path = os.getenv("PROJECT_PATH")
-        if env_project_path:
-            _settings_instance.project_path = os.path.abspath(env_project_path)
-        else:
-            _settings_instance.project_path = os.path.abspath(
-                _settings_instance.project_path
-            )
-
-        env_lancedb_uri = os.getenv("LANCEDB_URI")
-        if env_lancedb_uri:
-            if not os.path.isabs(env_lancedb_uri):
-                _settings_instance.lancedb_uri = os.path.join(
-                    _settings_instance.project_path, env_lancedb_uri
-                )
-            else:
-                _settings_instance.lancedb_uri = env_lancedb_uri
-        else:
-            if not os.path.isabs(_settings_instance.lancedb_uri):
-                _settings_instance.lancedb_uri = os.path.join(
-                    _settings_instance.project_path, _settings_instance.lancedb_uri
-                )
-
-        env_log_level = os.getenv("LOG_LEVEL")
-        if env_log_level:
-            _settings_instance.log_level = env_log_level.upper()
-
-    return _settings_instance
+    """Returns the process-wide settings, loaded from the environment on first use."""
+    return Settings()
@@ -1,16 +1,20 @@
+import logging
 import tiktoken
-from typing import List
+import xxhash
+from typing import Iterator, List, Sequence, Tuple
+
+log = logging.getLogger(__name__)
 
 # Using cl100k_base encoding, common for OpenAI models
 try:
     encoding = tiktoken.get_encoding("cl100k_base")
 except Exception:
-    print("Warning: cl100k_base encoding not found. Falling back to p50k_base.")
+    log.warning("cl100k_base encoding not found. Falling back to p50k_base.")
     try:
         encoding = tiktoken.get_encoding("p50k_base")
     except Exception:
-        print(
-            "Error: Neither cl100k_base nor p50k_base encoding found. Using basic character split."
+        log.error(
+            "Neither cl100k_base nor p50k_base encoding found. Using basic character split."
         )
         encoding = None
 
@@ -18,13 +22,48 @@ DEFAULT_CHUNK_SIZE = 512
 DEFAULT_OVERLAP = 128
 
 
-def chunk_content(
+def hash_chunk(chunk_text: str) -> str:
+    """
+    Returns a short content hash of a text chunk. Used to detect which chunks of a
+    modified file actually changed, so only those are re-embedded. Like file
+    change detection, this uses xxh3; 64 bits are plenty to tell a chunk's
+    versions apart.
+    """
+    return xxhash.xxh3_64_hexdigest(chunk_text.encode("utf-8"))
+
+
+def _count_windows(length: int, size: int, stride: int) -> int:
+    """Number of windows of `size` starting every `stride` items needed to cover `length` items."""
+    if length <= 0:
+        return 0
+    return -(-length // stride)  # ceil(length / stride)
+
+
+def _decode_token_chunks(
+    tokens: Sequence[int], chunk_size: int, stride: int
+) -> List[str]:
+    return [
+        encoding.decode(tokens[start_idx : start_idx + chunk_size])
+        for start_idx in range(0, len(tokens), stride)
+    ]
+
+
+def _iter_char_chunks(content: str, chunk_size: int, stride: int) -> Iterator[str]:
+    for start_idx in range(0, len(content), stride):
+        yield content[start_idx : start_idx + chunk_size]
+
+
+def stream_chunks(
     content: str,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
     overlap: int = DEFAULT_OVERLAP,
-) -> List[str]:
+) -> Tuple[int, Iterator[str]]:
     """
-    Chunks the given content into overlapping segments based on token count.
+    Chunks the given content into overlapping segments based on token count, for
+    callers that consume chunks one at a time. Token chunks are decoded up front,
+    so a tokenization or decoding failure still falls back to the character split
+    before any chunk is handed out; character chunks are sliced lazily, their
+    number following arithmetically from the content length and the stride.
 
     Args:
         content: The text content to chunk.
@@ -32,62 +71,50 @@ def chunk_content(
         overlap: The number of tokens to overlap between consecutive chunks.
 
     Returns:
-        A list of text chunks.
+        A tuple of (number of chunks, iterator over the chunk texts).
     """
     if not content:
-        return []
+        return 0, iter(())
 
     if overlap >= chunk_size:
         raise ValueError("Overlap must be smaller than chunk size.")
+    stride = chunk_size - overlap
 
     if encoding:
         try:
             tokens = encoding.encode(content)
-            chunks = []
-            start_idx = 0
-            while start_idx < len(tokens):
-                end_idx = min(start_idx + chunk_size, len(tokens))
-                chunk_tokens = tokens[start_idx:end_idx]
-                chunk_text = encoding.decode(chunk_tokens)
-                chunks.append(chunk_text)
-
-                # Move start_idx for the next chunk, considering overlap
-                next_start_idx = start_idx + chunk_size - overlap
-                # Ensure we make progress, especially if overlap is large or chunk_size is small
-                if next_start_idx <= start_idx:
-                    next_start_idx = start_idx + 1  # Force minimal progress
-
-                start_idx = next_start_idx
-
-            # Handle edge case where the last chunk might be empty if overlap logic pushes start_idx beyond len(tokens)
-            if (
-                not chunks and content
-            ):  # If no chunks were created but content exists (e.g., content shorter than overlap)
-                chunks.append(content)  # Add the whole content as one chunk
-
-            return chunks
-
+            chunks = _decode_token_chunks(tokens, chunk_size, stride)
+            return len(chunks), iter(chunks)
         except Exception as e:
-            print(
-                f"Warning: Tokenization/decoding failed ({e}). Falling back to character split."
+            log.warning(
+                f"Tokenization/decoding failed ({e}). Falling back to character split."
             )
 
-    char_chunks = []
-    start_idx = 0
     # Adjust chunk_size and overlap for characters (approximate)
     # Assuming ~4 chars per token as a rough estimate
     char_chunk_size = chunk_size * 4
-    char_overlap = overlap * 4
+    char_stride = stride * 4
+    return (
+        _count_windows(len(content), char_chunk_size, char_stride),
+        _iter_char_chunks(content, char_chunk_size, char_stride),
+    )
+
 
-    while start_idx < len(content):
-        end_idx = min(start_idx + char_chunk_size, len(content))
-        char_chunks.append(content[start_idx:end_idx])
-        next_start_idx = start_idx + char_chunk_size - char_overlap
-        if next_start_idx <= start_idx:
-            next_start_idx = start_idx + 1  # Force minimal progress
-        start_idx = next_start_idx
+def chunk_content(
+    content: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_OVERLAP,
+) -> List[str]:
+    """
+    Chunks the given content into overlapping segments based on token count.
 
-    if not char_chunks and content:
-        char_chunks.append(content)
+    Args:
+        content: The text content to chunk.
+        chunk_size: The target size of each chunk in tokens.
+        overlap: The number of tokens to overlap between consecutive chunks.
 
-    return char_chunks
+    Returns:
+        A list of text chunks.
+    """
+    _, chunks = stream_chunks(content, chunk_size, overlap)
+    return list(chunks)
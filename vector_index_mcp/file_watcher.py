@@ -1,16 +1,176 @@
 import os
-import hashlib
+import re
+import json
 import logging
+import functools
+import itertools
 import asyncio  # Added for asyncio.run_coroutine_threadsafe
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import pathspec
-from typing import List, Dict, TypedDict, Optional
+import xxhash
+from typing import (
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Dict,
+    NamedTuple,
+    Set,
+    Tuple,
+    TypedDict,
+    Optional,
+    Pattern,
+    Union,
+)
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.api import BaseObserver
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirMovedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+)
 
 from .indexer import Indexer  # Indexer methods are now async
 from .models import IndexedDocument, FileMetadata
-from .content_extractor import chunk_content
+from .content_extractor import hash_chunk, stream_chunks
+
+HASH_READ_BUFFER_SIZE = 1 << 20  # 1 MiB blocks for streamed hashing
+# Bytes sampled from each end of a large file for its fast fingerprint
+FINGERPRINT_SAMPLE_SIZE = 1 << 20
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+# Sidecar file (inside the LanceDB directory) persisting known_files across restarts
+KNOWN_FILES_FILENAME = "known_files.json"
+# A batch of queued watcher events is processed once this many have accumulated,
+# even if events are still arriving
+MAX_EVENT_BATCH = 1024
+# The index worker sends chunks to the indexer in batches of at most this many chunks / text bytes
+INDEX_BATCH_MAX_CHUNKS = 256
+INDEX_BATCH_MAX_BYTES = 4 << 20
+# Producers block once this many indexing jobs are waiting, bounding memory use
+INDEX_QUEUE_MAX_SIZE = 1024
+# The initial scan filters walked paths against the ignore patterns this many at a time
+SCAN_BATCH_SIZE = 1024
+# Files submitted to the scan pool but not yet processed, per scan worker
+SCAN_IN_FLIGHT_PER_WORKER = 4
+# The only events the observer subscribes to. Open/close events (and directory
+# "modified" events, raised alongside every file change) are not requested from
+# the kernel at all, so reads of project files -- including our own scans --
+# cost no event traffic. Directory creations/deletions keep recursive watches current.
+WATCHED_EVENT_TYPES = [
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileDeletedEvent,
+    FileMovedEvent,
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirMovedEvent,
+]
+# Filesystem types (as listed in /proc/mounts) whose changes made by other hosts
+# never reach the native observer, so the "auto" backend polls them instead
+NETWORK_FILESYSTEM_TYPES = frozenset(
+    {
+        "nfs",
+        "nfs4",
+        "cifs",
+        "smb3",
+        "smbfs",
+        "9p",
+        "afs",
+        "ceph",
+        "glusterfs",
+        "fuse.glusterfs",
+        "fuse.sshfs",
+        "lustre",
+    }
+)
+
+
+def _decode_text(data: bytes) -> str:
+    """Decodes file bytes as UTF-8 text, matching text-mode reads (errors ignored, universal newlines)."""
+    content = data.decode("utf-8", errors="ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _filesystem_type(path: str) -> Optional[str]:
+    """
+    Returns the type of the filesystem `path` lives on, from the most specific
+    mount point in /proc/mounts, or None where that is unavailable (e.g. not Linux).
+    """
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = f.read().splitlines()
+    except OSError:
+        return None
+    real_path = os.path.join(os.path.realpath(path), "")
+    best_mount, best_type = "", None
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Spaces in mount points are escaped as \040 in /proc/mounts
+        mount_point = os.path.join(fields[1].replace("\\040", " "), "")
+        if real_path.startswith(mount_point) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fields[2]
+    return best_type
+
+
+def _fadvise(fd: int, advice_name: str):
+    """
+    Passes an access-pattern hint (e.g. "POSIX_FADV_SEQUENTIAL") to the kernel for an
+    open file. A no-op on platforms without posix_fadvise; failures are ignored
+    since the hint is purely advisory.
+    """
+    if _HAS_FADVISE:
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice_name))
+        except OSError:
+            pass
+
+
+def _compile_ignore_regex(path_spec: pathspec.PathSpec) -> Optional[Pattern[str]]:
+    """
+    Joins the compiled regexes of all ignore patterns into one alternation, so a
+    path is matched with a single `re.match` instead of a loop over patterns.
+    Only possible without negation (`!`) patterns, whose result depends on pattern
+    order; returns None in that case and matching falls back to PathSpec.
+    """
+    regexes = []
+    for pattern in path_spec.patterns:
+        if pattern.include is None:  # Blank line or comment
+            continue
+        regex = getattr(pattern, "regex", None)
+        if not pattern.include or regex is None:
+            return None
+        # Each gitwildmatch regex names its trailing-slash group; names must be unique
+        regexes.append(f"(?:{regex.pattern.replace('(?P<ps_d>', '(?:')})")
+    if not regexes:
+        return None
+    try:
+        return re.compile("|".join(regexes))
+    except re.error as e:
+        logging.debug(f"Could not combine ignore patterns into one regex: {e}")
+        return None
+
+
+def _fingerprint(size: int, head: bytes, tail: bytes) -> str:
+    """Fast fingerprint of a large file: xxh3-128 over its size, first and last sample blocks."""
+    fingerprint = xxhash.xxh3_128()
+    fingerprint.update(size.to_bytes(8, "little"))
+    fingerprint.update(head)
+    fingerprint.update(tail)
+    return fingerprint.hexdigest()
 
 
 class KnownFileInfo(TypedDict):
@@ -21,13 +181,54 @@ class KnownFileInfo(TypedDict):
 
     hash: str
     last_modified: float
+    size: int
+    chunk_hashes: List[str]  # Per-chunk content hashes, in chunk order
 
 
-class FileWatcher:
+def _pending_entry() -> KnownFileInfo:
+    """
+    A known_files entry for a file whose index rows are being rewritten. It matches
+    no real mtime, size or hash, so unless the write is confirmed the file counts
+    as changed and gets re-indexed, with every chunk upserted.
+    """
+    return {"hash": "", "last_modified": -1.0, "size": -1, "chunk_hashes": []}
+
+
+class _IndexerCall(NamedTuple):
+    """Index queue item: a factory for an indexer coroutine, and the file it affects."""
+
+    make_call: Callable[[], Awaitable[object]]
+    file_path: Optional[str] = None
+
+
+class _KnownFileUpdate(NamedTuple):
+    """
+    Index queue item following a file's indexing jobs. Once they succeeded and
+    their rows were flushed, `info` replaces `placeholder` as the file's
+    known_files entry (None drops the entry). If the file changed again in the
+    meantime, its entry is no longer `placeholder` and is left alone.
+    """
+
+    file_path: str
+    placeholder: KnownFileInfo
+    info: Optional[KnownFileInfo]
+
+
+# An index queue item: a chunk to add, an indexer call, or a known_files update
+IndexJob = Union[IndexedDocument, _IndexerCall, _KnownFileUpdate]
+_NO_JOB = object()  # Marks "no pending job" in the index worker loop
+
+
+class FileWatcher(FileSystemEventHandler):
     """
     Monitors a project directory for file changes (creations, modifications, deletions)
     and triggers re-indexing actions accordingly. It uses a .gitignore-style mechanism
     to exclude specified files and directories.
+
+    The watcher is its own watchdog event handler: the observer thread only enqueues
+    (event_type, path) pairs; an event worker thread drains the queue in batches,
+    coalesces events per path, and processes each unique path once. This way the
+    several events an editor emits for a single save cost one re-index.
     """
 
     def __init__(
@@ -37,6 +238,12 @@ class FileWatcher:
         event_loop: Optional[asyncio.AbstractEventLoop],  # Added event_loop
         ignore_patterns: List[str] = None,
         abs_lancedb_path_to_ignore: Optional[str] = None,
+        scan_workers: Optional[int] = None,
+        debounce_period: float = 0.5,
+        fast_hash_large_files: bool = True,
+        fast_hash_threshold: int = 32 << 20,
+        observer_backend: str = "auto",
+        polling_interval: float = 5.0,
     ):
         """
         Initializes the FileWatcher.
@@ -48,13 +255,67 @@ class FileWatcher:
                              If None, only .gitignore from project_path is used.
             abs_lancedb_path_to_ignore: The absolute canonical path to the LanceDB
                                         directory, which should always be ignored.
+            scan_workers: Number of threads used to hash and chunk files during the
+                          initial scan. Defaults to twice the CPU count (capped at 32).
+            debounce_period: Quiet window in seconds after the last file event before
+                             the queued events are coalesced and processed.
+            fast_hash_large_files: If True, files larger than `fast_hash_threshold`
+                                   bytes are fingerprinted from their size and first
+                                   and last 1 MiB instead of being hashed in full.
+            fast_hash_threshold: Size in bytes above which the fast fingerprint is used.
+            observer_backend: "native" for the platform's event-driven observer (inotify
+                              on Linux), "polling" to stat the tree periodically, or
+                              "auto" to poll only on network filesystems.
+            polling_interval: Seconds between tree scans of the polling observer.
         """
         self.project_path = project_path
         self.project_root = Path(project_path).resolve()
         self.indexer: Optional[Indexer] = indexer
         self.event_loop: Optional[asyncio.AbstractEventLoop] = event_loop
         self.abs_lancedb_path_to_ignore = abs_lancedb_path_to_ignore
-        self.known_files: Dict[str, KnownFileInfo] = {}
+        # The LanceDB directory relative to the project root, for matching scan paths without resolving them
+        self._lancedb_rel_path: Optional[str] = None
+        if abs_lancedb_path_to_ignore:
+            lancedb_rel_path = os.path.relpath(
+                abs_lancedb_path_to_ignore, self.project_root
+            )
+            if lancedb_rel_path != os.pardir and not lancedb_rel_path.startswith(
+                os.pardir + os.sep
+            ):
+                self._lancedb_rel_path = lancedb_rel_path
+        # Event and scan paths are derived from project_path, so ignore checks can
+        # strip this sep-terminated prefix with plain string ops instead of resolving
+        self._root_str = os.path.join(os.path.abspath(project_path), "")
+        self._root_len = len(self._root_str)
+        lancedb_prefixes = set()
+        if abs_lancedb_path_to_ignore:
+            lancedb_prefixes.add(os.path.join(abs_lancedb_path_to_ignore, ""))
+        if self._lancedb_rel_path:
+            lancedb_prefixes.add(
+                os.path.join(self._root_str, self._lancedb_rel_path, "")
+            )
+        self._lancedb_prefixes = tuple(lancedb_prefixes)
+        # Guards known_files writes, which happen from initial scan workers and the observer thread
+        self._known_files_lock = threading.Lock()
+        # Serializes save_known_files, which the end of a scan and stop() can run at once
+        self._known_files_save_lock = threading.Lock()
+        # known_files is persisted next to the index it describes, so both share a lifetime
+        self._known_files_path: Optional[str] = (
+            os.path.join(abs_lancedb_path_to_ignore, KNOWN_FILES_FILENAME)
+            if abs_lancedb_path_to_ignore
+            else None
+        )
+        self.known_files: Dict[str, KnownFileInfo] = self._load_known_files()
+        # True once known_files was reset along with the index: every file with rows
+        # in the index then has an entry, so files without one can be appended
+        # without first upserting over rows they might already have
+        self._index_is_fresh = False
+        # Per-thread read buffers reused across files by _calculate_hash
+        self._hash_buffers = threading.local()
+        self.scan_workers = scan_workers or min(32, (os.cpu_count() or 1) * 2)
+        self.debounce_period = debounce_period
+        self.fast_hash_large_files = fast_hash_large_files
+        self.fast_hash_threshold = fast_hash_threshold
 
         patterns = ignore_patterns or []
         gitignore_path = self.project_root / ".gitignore"
@@ -69,19 +330,162 @@ class FileWatcher:
                 logging.error(f"Error reading .gitignore file at {gitignore_path}: {e}")
         # PathSpec is used to efficiently match paths against .gitignore style patterns
         self.path_spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+        self._ignore_regex = _compile_ignore_regex(self.path_spec)
+        # Directory verdicts are memoized: every event or scanned file below an
+        # ignored directory (e.g. node_modules/) resolves with one cache lookup
+        self._is_ignored_dir = functools.lru_cache(maxsize=4096)(self._is_ignored_dir)
         logging.info(
             f"FileWatcher initialized for project: {self.project_path}. Ignoring {len(patterns)} patterns."
         )
 
-        self.observer = Observer()
-        self.event_handler = ProjectEventHandler(self)
+        # Hashing/chunking (producers) runs ahead of embedding/indexing, which a
+        # single worker drains in batches. One FIFO keeps per-file operations ordered.
+        self.index_queue: "queue.Queue[Optional[IndexJob]]" = queue.Queue(
+            maxsize=INDEX_QUEUE_MAX_SIZE
+        )
+        self._index_worker: Optional[threading.Thread] = None
+        self._index_worker_lock = threading.Lock()
+
+        super().__init__()
+        self.event_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._event_worker: Optional[threading.Thread] = None
+        self.observer = self._create_observer(observer_backend, polling_interval)
+        # Set by stop(); a running initial scan then skips its remaining files
+        self._stopping = threading.Event()
+        # Files checked so far by the running (or last) initial scan, for progress reporting
+        self.files_scanned = 0
+
+    def _create_observer(self, backend: str, polling_interval: float) -> BaseObserver:
+        """
+        Creates the watchdog observer for `backend`. Native observers do not see
+        changes made on other hosts of a network filesystem, so "auto" falls back
+        to polling when the project lives on one.
+        """
+        if backend == "auto":
+            fs_type = _filesystem_type(self.project_path)
+            backend = "polling" if fs_type in NETWORK_FILESYSTEM_TYPES else "native"
+            if backend == "polling":
+                logging.info(
+                    f"Project is on a '{fs_type}' network filesystem; watching it by polling every {polling_interval}s."
+                )
+        if backend == "polling":
+            return PollingObserver(timeout=polling_interval)
+        if backend != "native":
+            raise ValueError(f"Unknown file watcher backend: {backend}")
+        return Observer()
+
+    def _load_known_files(self) -> Dict[str, KnownFileInfo]:
+        """
+        Loads the known_files state saved by a previous run, so a warm restart only
+        re-hashes files whose mtime or size changed since then.
+        """
+        if not self._known_files_path or not os.path.isfile(self._known_files_path):
+            return {}
+        try:
+            with open(self._known_files_path, "r", encoding="utf-8") as f:
+                known_files = json.load(f)
+            if not isinstance(known_files, dict):
+                raise ValueError("expected a JSON object")
+            logging.info(
+                f"Loaded {len(known_files)} known files from {self._known_files_path}"
+            )
+            return known_files
+        except Exception as e:
+            logging.warning(
+                f"Could not load known files from {self._known_files_path}, starting with a full scan: {e}"
+            )
+            return {}
+
+    def save_known_files(self):
+        """
+        Persists known_files to the sidecar file. The file is written to a temporary
+        path and renamed into place, so a crash never leaves a truncated file behind.
+        """
+        if not self._known_files_path:
+            return
+        with self._known_files_lock:
+            snapshot = dict(self.known_files)
+        tmp_path = f"{self._known_files_path}.tmp"
+        try:
+            with self._known_files_save_lock:
+                os.makedirs(os.path.dirname(self._known_files_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self._known_files_path)
+            logging.debug(
+                f"Saved {len(snapshot)} known files to {self._known_files_path}"
+            )
+        except Exception as e:
+            logging.error(
+                f"Error saving known files to {self._known_files_path}: {e}",
+                exc_info=True,
+            )
+
+    def reset_known_files(self):
+        """
+        Forgets all known files, so the next scan re-indexes every file. Used when
+        the index is cleared or created from scratch.
+        """
+        with self._known_files_lock:
+            self.known_files.clear()
+            self._index_is_fresh = True
+        logging.info("Known files reset; the next scan will re-index all files.")
+
+    def _begin_update(
+        self, file_path: str
+    ) -> Tuple[Optional[KnownFileInfo], KnownFileInfo]:
+        """
+        Marks a file as pending before its index rows are changed, replacing its
+        known_files entry with a fresh placeholder (see _pending_entry). The real
+        entry is only recorded once the index worker confirms the write, so a file
+        whose indexing fails is never saved as indexed.
+
+        Returns:
+            A tuple of (previous entry or None, placeholder).
+        """
+        placeholder = _pending_entry()
+        with self._known_files_lock:
+            previous = self.known_files.get(file_path)
+            self.known_files[file_path] = placeholder
+        return previous, placeholder
+
+    def _commit_known_files(self, updates: List[_KnownFileUpdate]):
+        """Records the known_files entries of files whose indexing was confirmed."""
+        with self._known_files_lock:
+            for update in updates:
+                if self.known_files.get(update.file_path) is not update.placeholder:
+                    continue  # The file changed again; its newer update is pending
+                if update.info is None:
+                    del self.known_files[update.file_path]
+                else:
+                    self.known_files[update.file_path] = update.info
 
     def _calculate_hash(self, file_path: str) -> str:
-        """Calculates the SHA256 hash of a file's content."""
+        """
+        Calculates the xxh3-128 hash of a file's content. The hash is only used for
+        change detection, so a fast non-cryptographic hash is sufficient. The file is
+        streamed through a per-thread buffer that is reused across files, so memory
+        use stays constant regardless of size and no per-file buffers are allocated.
+        Files are deliberately not memory-mapped: the watcher hashes files while
+        editors truncate and rewrite them, and touching a mapped page past the new
+        end of file raises SIGBUS, killing the process. Files above the fast-hash
+        threshold only have their size and first/last blocks fingerprinted,
+        costing a few reads.
+        """
         try:
-            with open(file_path, "rb") as f:
-                file_hash = hashlib.sha256(f.read()).hexdigest()
-                return file_hash
+            with open(file_path, "rb", buffering=0) as f:
+                _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+                size = os.fstat(f.fileno()).st_size
+                if self.fast_hash_large_files and size > self.fast_hash_threshold:
+                    head = f.read(FINGERPRINT_SAMPLE_SIZE)
+                    f.seek(-FINGERPRINT_SAMPLE_SIZE, os.SEEK_END)
+                    tail = f.read(FINGERPRINT_SAMPLE_SIZE)
+                    return _fingerprint(size, head, tail)
+                file_hash = xxhash.xxh3_128()
+                buffer = self._hash_buffer()
+                while n := f.readinto(buffer):
+                    file_hash.update(buffer[:n])
+                return file_hash.hexdigest()
         except FileNotFoundError:
             logging.warning(f"File not found when calculating hash: {file_path}")
             return ""
@@ -89,64 +493,140 @@ class FileWatcher:
             logging.error(f"Error calculating hash for {file_path}: {e}", exc_info=True)
             return ""
 
-    def _get_last_modified(self, file_path: str) -> float:
-        """Gets the last modified timestamp of a file."""
+    def _hash_buffer(self) -> memoryview:
+        """Returns this thread's read buffer for hashing, allocating it on first use."""
+        buffer = getattr(self._hash_buffers, "buffer", None)
+        if buffer is None:
+            buffer = memoryview(bytearray(HASH_READ_BUFFER_SIZE))
+            self._hash_buffers.buffer = buffer
+        return buffer
+
+    def _hash_bytes(self, data: bytes) -> str:
+        """Hashes already-read file content, consistently with _calculate_hash."""
+        size = len(data)
+        if self.fast_hash_large_files and size > self.fast_hash_threshold:
+            return _fingerprint(
+                size, data[:FINGERPRINT_SAMPLE_SIZE], data[-FINGERPRINT_SAMPLE_SIZE:]
+            )
+        return xxhash.xxh3_128_hexdigest(data)
+
+    def _read_file(self, file_path: str) -> bytes:
+        """
+        Reads a file's raw bytes. Errors propagate to the caller. This is the last
+        read of the file's content, so its pages are dropped from the page cache
+        afterwards rather than evicting more useful data during large scans.
+        """
+        with open(file_path, "rb", buffering=0) as f:
+            _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+            data = f.read()
+            _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+        return data
+
+    def _stat(self, file_path: str) -> Optional[os.stat_result]:
+        """Returns the stat result of a file, or None if it cannot be stat'ed."""
         try:
-            return os.path.getmtime(file_path)
+            return os.stat(file_path)
         except FileNotFoundError:
-            logging.warning(
-                f"File not found when getting last modified time: {file_path}"
-            )
-            return 0
+            logging.warning(f"File not found when reading file status: {file_path}")
+            return None
         except Exception as e:
             logging.error(
-                f"Error getting last modified time for {file_path}: {e}", exc_info=True
+                f"Error reading file status for {file_path}: {e}", exc_info=True
             )
-            return 0
+            return None
+
+    def _detect_change(self, file_path: str, st: os.stat_result) -> Tuple[bool, str]:
+        """
+        Decides whether a file needs re-indexing. The file is only hashed when its
+        mtime or size differ from the values recorded in `known_files`, so spurious
+        or metadata-only events cost a single stat() instead of a full read.
+
+        Returns:
+            A tuple of (needs_reindex, content_hash). The hash is empty for files not
+            in `known_files`, or if it could not be calculated.
+        """
+        known_info = self.known_files.get(file_path)
+        if not known_info:
+            # Nothing to compare against; the hash is computed while the file is read for indexing.
+            return True, ""
+        if (
+            known_info["last_modified"] == st.st_mtime
+            and known_info["size"] == st.st_size
+        ):
+            logging.debug(f"mtime and size unchanged for {file_path}. Skipping hash.")
+            return False, known_info["hash"]
+
+        file_hash = self._calculate_hash(file_path)
+        if file_hash and file_hash == known_info["hash"]:
+            # Only the metadata changed; refresh the fingerprint so the next event
+            # for this file short-circuits on stat() alone.
+            with self._known_files_lock:
+                known_info["last_modified"] = st.st_mtime
+                known_info["size"] = st.st_size
+            logging.debug(f"Content hash unchanged for {file_path}. Skipping re-index.")
+            return False, file_hash
+        return True, file_hash
 
     def _should_ignore(self, path: str) -> bool:
         """
-        Determines if a given path should be ignored based on .gitignore rules,
-        being outside the project root, or being the LanceDB directory itself.
+        Determines if a given file path should be ignored based on .gitignore rules,
+        being outside the project root, or being inside the LanceDB directory itself.
+        Uses string operations only (no resolve/realpath syscalls), since paths come
+        from watchdog or the scan and are rooted at project_path. Callers only pass
+        file paths; directory events are filtered out by the event handler.
         """
-        real_event_path = os.path.realpath(path)
+        absolute_path = os.path.abspath(path)  # Pure string normalization
 
         # Explicitly ignore the LanceDB directory to prevent self-indexing or loops
-        if self.abs_lancedb_path_to_ignore and real_event_path.startswith(
-            self.abs_lancedb_path_to_ignore
-        ):
+        if absolute_path.startswith(self._lancedb_prefixes):
             logging.debug(
-                f"Ignoring path '{real_event_path}' as it is within the LanceDB directory '{self.abs_lancedb_path_to_ignore}'."
+                f"Ignoring path '{path}' as it is within the LanceDB directory '{self.abs_lancedb_path_to_ignore}'."
             )
             return True
 
-        absolute_path = Path(path).resolve()
-        if (
-            absolute_path.is_dir()
-        ):  # Always ignore directories themselves, only process files
-            logging.debug(f"Ignoring directory path: {absolute_path}")
-            return True
-
-        try:
-            # PathSpec works with paths relative to the directory where .gitignore (or patterns) are defined.
-            relative_path = absolute_path.relative_to(self.project_root)
-            is_ignored = self.path_spec.match_file(str(relative_path))
-            if is_ignored:
-                logging.debug(
-                    f"Ignoring path '{path}' due to match in ignore patterns (relative: '{relative_path}')."
-                )
-            return is_ignored
-        except ValueError:
-            # This occurs if absolute_path is not inside self.project_root
+        if not absolute_path.startswith(self._root_str):
             logging.debug(
                 f"Ignoring path '{path}' as it is outside the project root '{self.project_root}'."
             )
             return True
 
-    def _process_and_index_file(self, file_path: str) -> bool:
+        # PathSpec works with paths relative to the directory where .gitignore (or patterns) are defined.
+        relative_path = absolute_path[self._root_len :]
+        parent_dir = os.path.dirname(relative_path)
+        if (
+            self._ignore_regex is not None
+            and parent_dir
+            and self._is_ignored_dir(parent_dir)
+        ):
+            # Without negation patterns, nothing below an ignored directory can be re-included
+            is_ignored = True
+        else:
+            is_ignored = self._match_file(relative_path)
+        if is_ignored:
+            logging.debug(
+                f"Ignoring path '{path}' due to match in ignore patterns (relative: '{relative_path}')."
+            )
+        return is_ignored
+
+    def _process_and_index_file(
+        self,
+        file_path: str,
+        st: Optional[os.stat_result] = None,
+        file_hash: str = "",
+    ) -> bool:
         """
         Reads the content of a file, splits it into chunks, generates embeddings,
-        and adds/updates these chunks in the index. Updates `known_files` state.
+        and adds/updates these chunks in the index. Updates `known_files` state
+        once the index worker has written the chunks (see _begin_update).
+        Chunks are only produced here; the index worker embeds and writes them in
+        batches. For a file that is already indexed, only the chunks whose hash
+        differs from the recorded per-chunk hashes are re-embedded
+        (see Indexer.update_document_chunks).
+
+        Args:
+            file_path: The file to process.
+            st: The file's stat result, if the caller already has it.
+            file_hash: The file's content hash, if the caller already computed it.
 
         Returns:
             True if processing was successful (or file was skipped appropriately), False on error.
@@ -158,74 +638,121 @@ class FileWatcher:
             )
             return False
         try:
-            file_hash = self._calculate_hash(file_path)
-            last_modified = self._get_last_modified(file_path)
+            if st is None:
+                st = os.stat(file_path)
+            last_modified = st.st_mtime
+            size = st.st_size
 
-            if not file_hash:  # Hash calculation failed (e.g. file disappeared)
-                logging.warning(
-                    f"Could not calculate hash for {file_path}, skipping processing."
-                )
-                return False  # Cannot proceed without a hash
+            # Read the file once; the hash is computed from the same bytes that are decoded
+            data = self._read_file(file_path)
+            if not file_hash:
+                file_hash = self._hash_bytes(data)
+            content = _decode_text(data)
 
-            # Read file content
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
+            # Chunks are produced lazily; the count is known up front for total_chunks
+            total_chunks, chunks = stream_chunks(content)
 
-            chunks = chunk_content(
-                content
-            )  # Assumes chunk_content handles empty content gracefully
-            total_chunks = len(chunks)
+            known_info, placeholder = self._begin_update(file_path)
 
             if total_chunks == 0:
                 logging.info(
                     f"File '{file_path}' is empty or resulted in no processable chunks. Removing from index if present."
                 )
-                # Record its hash/mtime to avoid reprocessing if unchanged but empty
-                self.known_files[file_path] = {
-                    "hash": file_hash,
-                    "last_modified": last_modified,
-                }
                 # Ensure any previous index entries for this file are removed if it became empty
-                if self.indexer and self.event_loop:  # Check event_loop too
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.indexer.remove_document(file_path), self.event_loop
-                    )
-                    # future.result(timeout=5) # Optional: wait for completion, but can block watcher
-                    logging.debug(
-                        f"Scheduled remove_document for empty file {file_path}. Future: {future}"
+                self._schedule_indexer_call(
+                    lambda: self.indexer.remove_document(file_path), file_path
+                )
+                # Record its hash/mtime to avoid reprocessing if unchanged but empty
+                self._enqueue_index_job(
+                    _KnownFileUpdate(
+                        file_path,
+                        placeholder,
+                        {
+                            "hash": file_hash,
+                            "last_modified": last_modified,
+                            "size": size,
+                            "chunk_hashes": [],
+                        },
                     )
+                )
+                logging.debug(f"Queued remove_document for empty file {file_path}.")
                 return True  # Processed (by acknowledging it's empty)
 
-            # Process and index each chunk
+            if known_info is not None:
+                # Files indexed before per-chunk hashes were recorded get every chunk upserted
+                previous_hashes = known_info.get("chunk_hashes", [])
+            elif self._index_is_fresh:
+                previous_hashes = None  # Not in the index yet: plain append
+            else:
+                # The file may still have rows from a run whose known_files were lost
+                # (e.g. the process was killed before saving), so upsert every chunk
+                previous_hashes = []
+
+            # One metadata instance is shared by reference across all chunks of the file
+            metadata = FileMetadata(original_path=file_path)
+            chunk_hashes: List[str] = []
+            changed_documents: List[IndexedDocument] = []
             for i, chunk_text in enumerate(chunks):
-                chunk_doc_id = f"{file_path}::{i}"
+                chunk_hash = hash_chunk(chunk_text)
+                chunk_hashes.append(chunk_hash)
+                if (
+                    previous_hashes is not None
+                    and i < len(previous_hashes)
+                    and previous_hashes[i] == chunk_hash
+                ):
+                    continue  # Unchanged chunk; its embedding is still valid
                 document = IndexedDocument(
-                    document_id=chunk_doc_id,
+                    document_id=f"{file_path}::{i}",
                     file_path=file_path,  # Store relative or absolute path consistently
+                    project_path=self.project_path,
                     content_hash=file_hash,
                     last_modified_timestamp=last_modified,
                     chunk_index=i,
                     total_chunks=total_chunks,
                     extracted_text_chunk=chunk_text,
-                    metadata=FileMetadata(original_path=file_path),
-                    # The 'vector' field is populated by the indexer's add_or_update_document method
+                    metadata=metadata,
+                    # The 'vector' field is populated by the indexer
                 )
-                if self.indexer and self.event_loop:  # Check event_loop too
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.indexer.add_or_update_document(document), self.event_loop
-                    )
-                    # future.result(timeout=5) # Optional: wait for completion
-                    logging.debug(
-                        f"Scheduled add_or_update_document for chunk {document.document_id}. Future: {future}"
-                    )
+                if previous_hashes is None:
+                    # New file: stream each chunk to the index worker as it is produced
+                    self._enqueue_index_job(document)
+                else:
+                    changed_documents.append(document)
+
+            if previous_hashes is not None:
+                # Already indexed: upsert changed chunks, drop surplus ones, refresh the rest
+                self._schedule_indexer_call(
+                    lambda: self.indexer.update_document_chunks(
+                        file_path,
+                        changed_documents,
+                        total_chunks,
+                        file_hash,
+                        last_modified,
+                    ),
+                    file_path,
+                )
+                logging.debug(
+                    f"Queued update_document_chunks for {file_path} ({len(changed_documents)} of {total_chunks} chunks changed)."
+                )
+                indexed_chunks = len(changed_documents)
+            else:
+                indexed_chunks = total_chunks
 
-            # Update known_files state only after successful processing of all chunks
-            self.known_files[file_path] = {
-                "hash": file_hash,
-                "last_modified": last_modified,
-            }
+            # known_files is updated once the worker has written all of the file's chunks
+            self._enqueue_index_job(
+                _KnownFileUpdate(
+                    file_path,
+                    placeholder,
+                    {
+                        "hash": file_hash,
+                        "last_modified": last_modified,
+                        "size": size,
+                        "chunk_hashes": chunk_hashes,
+                    },
+                )
+            )
             logging.info(
-                f"Successfully indexed {total_chunks} chunks for file: {file_path}"
+                f"Queued {indexed_chunks} of {total_chunks} chunks for indexing for file: {file_path}"
             )
             return True
 
@@ -234,57 +761,342 @@ class FileWatcher:
                 f"File not found during processing (it may have been deleted rapidly): {file_path}"
             )
             # If file is gone, ensure it's removed from known_files and index
-            if file_path in self.known_files:
-                del self.known_files[file_path]
-            if self.indexer and self.event_loop:  # Check event_loop too
-                future = asyncio.run_coroutine_threadsafe(
-                    self.indexer.remove_document(file_path), self.event_loop
-                )
-                # future.result(timeout=5)
-                logging.debug(
-                    f"Scheduled remove_document for file not found during processing {file_path}. Future: {future}"
-                )
+            self._queue_removal(file_path)
+            logging.debug(
+                f"Queued remove_document for file not found during processing {file_path}."
+            )
             return False  # Indicate processing did not complete for this file
         except Exception as e:
             logging.error(f"Error processing file {file_path}: {e}", exc_info=True)
             return False
 
+    def _schedule_indexer_call(
+        self,
+        make_call: Callable[[], Awaitable[object]],
+        file_path: Optional[str] = None,
+    ):
+        """
+        Queues an indexer call (e.g. a removal) for the index worker. It runs after
+        all previously queued jobs, so operations on the same file stay in order.
+        If the call fails, the pending known_files update of `file_path` is dropped.
+        """
+        self._enqueue_index_job(_IndexerCall(make_call, file_path))
+
+    def _queue_removal(self, file_path: str):
+        """Queues removing a file's chunks; its known_files entry goes once they are gone."""
+        _, placeholder = self._begin_update(file_path)
+        self._schedule_indexer_call(
+            lambda: self.indexer.remove_document(file_path), file_path
+        )
+        self._enqueue_index_job(_KnownFileUpdate(file_path, placeholder, None))
+
+    def _enqueue_index_job(self, job: IndexJob):
+        """Puts a job on the bounded index queue, starting the worker on first use."""
+        with self._index_worker_lock:
+            if self._index_worker is None or not self._index_worker.is_alive():
+                self._index_worker = threading.Thread(
+                    target=self._run_index_worker, name="index-worker", daemon=True
+                )
+                self._index_worker.start()
+        self.index_queue.put(job)  # Blocks while the queue is full (backpressure)
+
+    def _run_indexer_call(self, make_call: Callable[[], Awaitable[object]]) -> bool:
+        """
+        Runs an indexer coroutine on the event loop and waits for it to finish.
+
+        Returns:
+            True if the call succeeded; False if it raised or reported failure by
+            returning False (as remove_document does).
+        """
+        if not self.indexer or not self.event_loop:
+            logging.warning(
+                "Indexer or event loop not available. Dropping queued indexing job."
+            )
+            return False
+        try:
+            result = asyncio.run_coroutine_threadsafe(
+                make_call(), self.event_loop
+            ).result()
+        except Exception as e:
+            logging.error(f"Error running queued indexing job: {e}", exc_info=True)
+            return False
+        return result is not False
+
+    def _run_index_worker(self):
+        """
+        Index worker loop. Consecutive queued chunks are coalesced into one
+        add_or_update_documents call (up to INDEX_BATCH_MAX_CHUNKS chunks or
+        INDEX_BATCH_MAX_BYTES of text); other jobs run in queue order in between.
+        Whenever the queue runs empty the indexer's write buffer is flushed, so
+        buffered rows reach the table before wait_for_indexing returns.
+        Stops at a None sentinel, after everything queued before it.
+
+        known_files updates are held until that flush succeeds, and dropped for
+        files with a failed job, or if any buffered write failed since the last
+        flush; those files keep their placeholder entry and are re-indexed later.
+        Once the watcher is stopping, remaining jobs are dropped the same way.
+        """
+        failed_paths: Set[str] = set()
+        unflushed: List[_KnownFileUpdate] = []
+        write_failures = self.indexer.write_failures if self.indexer else 0
+        dropped = 0
+        while True:
+            job = self.index_queue.get()
+            if job is not None and self._stopping.is_set():
+                dropped += 1
+                self.index_queue.task_done()
+                continue
+            if job is None and dropped:
+                logging.info(
+                    f"Dropped {dropped} pending indexing jobs on stop; their files will be re-indexed on the next scan."
+                )
+            taken = 1
+            batch: List[IndexedDocument] = []
+            batch_bytes = 0
+            while isinstance(job, IndexedDocument):
+                batch.append(job)
+                batch_bytes += len(job.extracted_text_chunk)
+                job = _NO_JOB
+                if (
+                    len(batch) >= INDEX_BATCH_MAX_CHUNKS
+                    or batch_bytes >= INDEX_BATCH_MAX_BYTES
+                ):
+                    break
+                try:
+                    job = self.index_queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+
+            if batch and not self._run_indexer_call(
+                lambda: self.indexer.add_or_update_documents(batch)
+            ):
+                failed_paths.update(doc.file_path for doc in batch)
+            if isinstance(job, _IndexerCall):
+                if not self._run_indexer_call(job.make_call) and job.file_path:
+                    failed_paths.add(job.file_path)
+            elif isinstance(job, _KnownFileUpdate):
+                if job.file_path in failed_paths:
+                    failed_paths.discard(job.file_path)
+                    logging.warning(
+                        f"Indexing failed for {job.file_path}; it will be re-indexed on its next change or scan."
+                    )
+                else:
+                    unflushed.append(job)
+            if self.index_queue.empty():
+                flushed = self._run_indexer_call(self.indexer.flush)
+                if flushed and self.indexer.write_failures == write_failures:
+                    self._commit_known_files(unflushed)
+                elif unflushed:
+                    logging.warning(
+                        f"Buffered index writes failed; {len(unflushed)} files will be re-indexed on their next change or scan."
+                    )
+                unflushed = []
+                write_failures = self.indexer.write_failures
+            for _ in range(taken):
+                self.index_queue.task_done()
+            if job is None:
+                return
+
+    def wait_for_indexing(self):
+        """Blocks until every queued indexing job has been processed."""
+        if self._index_worker is not None:
+            self.index_queue.join()
+
+    def _stop_index_worker(self, timeout: float = 10) -> bool:
+        """
+        Lets the index worker drain the queue, then stops it.
+
+        Returns:
+            True if everything queued was processed, False if the worker timed out.
+        """
+        worker = self._index_worker
+        if worker is None or not worker.is_alive():
+            return True
+        try:
+            self.index_queue.put(None, timeout=timeout)
+        except queue.Full:
+            logging.warning("Index queue is still full; not waiting for it to drain.")
+            return False
+        worker.join(timeout=timeout)
+        if worker.is_alive():
+            logging.warning("Index worker did not finish draining the queue in time.")
+            return False
+        return True
+
+    def _match_file(self, rel_path: str) -> bool:
+        """Matches a project-relative path against the ignore patterns."""
+        if self._ignore_regex is None:
+            return self.path_spec.match_file(rel_path)
+        if os.sep != "/":
+            rel_path = rel_path.replace(os.sep, "/")
+        return self._ignore_regex.match(rel_path) is not None
+
+    def _is_ignored_dir(self, rel_dir: str) -> bool:
+        """
+        Checks whether a directory (given relative to the project root) is ignored
+        as a whole, so its subtree can be skipped without listing it. The trailing
+        slash makes PathSpec apply directory-only patterns such as `build/`.
+        A directory inside an ignored directory is ignored too. Memoized per
+        instance with an LRU cache (see __init__), so ancestors are checked once.
+        """
+        if rel_dir == self._lancedb_rel_path:
+            return True
+        if self._match_file(rel_dir + "/"):
+            return True
+        parent_dir = os.path.dirname(rel_dir)
+        return bool(parent_dir) and self._is_ignored_dir(parent_dir)
+
+    def _scandir_walk(self, root: str) -> Iterator[os.DirEntry]:
+        """
+        Recursively yields the non-directory entries under `root` using os.scandir.
+        Entry types come from the cached directory listing, and each entry's stat()
+        result is cached on the DirEntry, so the scan needs no extra syscalls to
+        tell files from directories. Like os.walk, symlinked directories are not followed.
+        Ignored directories (e.g. `.git/`, `__pycache__/`, the LanceDB directory)
+        are pruned here, so their subtrees are never listed.
+        """
+        # Each pending directory carries its path relative to root, for ignore matching
+        pending_dirs = [(root, "")]
+        while pending_dirs:
+            current_dir, rel_prefix = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                if entry.is_symlink():
+                                    continue
+                                rel_dir = rel_prefix + entry.name
+                                if self._is_ignored_dir(rel_dir):
+                                    logging.debug(
+                                        f"Pruning ignored directory: {entry.path}"
+                                    )
+                                    continue
+                                pending_dirs.append((entry.path, rel_dir + os.sep))
+                            else:
+                                yield entry
+                        except OSError as e:
+                            logging.warning(f"Could not inspect {entry.path}: {e}")
+            except OSError as e:
+                logging.warning(f"Could not list directory {current_dir}: {e}")
+
+    def _iter_scan_candidates(self) -> Iterator[os.DirEntry]:
+        """
+        Yields the files the initial scan should check, walking the tree lazily and
+        filtering ignored paths SCAN_BATCH_SIZE entries at a time, so files are
+        checked while the walk continues and the tree is never held in memory.
+        """
+        walk = self._scandir_walk(self.project_path)
+        while batch := list(itertools.islice(walk, SCAN_BATCH_SIZE)):
+            yield from self._filter_ignored(batch)
+
+    def _filter_ignored(self, entries: List[os.DirEntry]) -> List[os.DirEntry]:
+        """
+        Drops ignored entries from a batch of scanned paths. All relative paths are
+        matched in one sweep (with the combined ignore regex, or a single
+        PathSpec.match_files call when negation patterns are present), instead of
+        resolving and matching each path individually via _should_ignore.
+        """
+        rel_paths = [
+            os.path.relpath(entry.path, self.project_path) for entry in entries
+        ]
+        if self._ignore_regex is not None:
+            ignored = {rel_path for rel_path in rel_paths if self._match_file(rel_path)}
+        else:
+            ignored = set(self.path_spec.match_files(rel_paths))
+        lancedb_rel_path = self._lancedb_rel_path
+        if lancedb_rel_path:
+            lancedb_prefix = lancedb_rel_path + os.sep
+            ignored.update(
+                rel_path
+                for rel_path in rel_paths
+                if rel_path == lancedb_rel_path or rel_path.startswith(lancedb_prefix)
+            )
+        if ignored:
+            logging.debug(f"Ignoring {len(ignored)} paths matched by ignore patterns.")
+        return [
+            entry
+            for entry, rel_path in zip(entries, rel_paths)
+            if rel_path not in ignored
+        ]
+
+    def _scan_file(self, entry: os.DirEntry) -> bool:
+        """
+        Checks a single file during the initial scan and chunks it if it is new or changed.
+        Runs on the initial scan's worker threads.
+
+        Returns:
+            True if the file was checked or processed successfully, False on error.
+        """
+        file_path = entry.path
+        if self._stopping.is_set():
+            return False
+        try:
+            st = entry.stat()  # Cached on the DirEntry after the first call
+        except OSError as e:
+            logging.warning(f"Could not read file status for {file_path}: {e}")
+            return False
+
+        # Skip known files whose mtime/size (and, if those differ, hash) are unchanged
+        needs_reindex, file_hash = self._detect_change(file_path, st)
+        if not needs_reindex:
+            logging.debug(
+                f"Skipping unchanged known file during initial scan: {file_path}"
+            )
+            return True  # Count as "processed" in the sense of "checked"
+
+        logging.debug(f"Initial scan: Processing file {file_path}")
+        return self._process_and_index_file(file_path, st=st, file_hash=file_hash)
+
     def initial_scan(self):
         """
         Performs an initial scan of the project directory, processing and indexing
-        all relevant files that are not ignored.
+        all relevant files that are not ignored. Files are hashed and chunked on a
+        thread pool, since file I/O and hashing release the GIL, while the index
+        worker embeds and writes their chunks in batches. Returns once everything
+        queued by the scan has been indexed.
         """
         logging.info(f"Starting initial project scan for: {self.project_path}...")
+        self.files_scanned = 0
         processed_files_count = 0
-        for root, _, files in os.walk(self.project_path, topdown=True):
-            # Filter out ignored directories from os.walk itself if possible,
-            # though _should_ignore will also catch files within them.
-            # For now, _should_ignore handles individual files.
-            for file_name in files:
-                file_path = os.path.join(root, file_name)
-                if self._should_ignore(file_path):
-                    continue
-
-                # Check if file is already known and unchanged to avoid redundant processing
-                known_info = self.known_files.get(file_path)
-                if known_info:
-                    current_hash = self._calculate_hash(file_path)
-                    current_modified = self._get_last_modified(file_path)
-                    if (
-                        current_hash == known_info["hash"]
-                        and current_modified == known_info["last_modified"]
-                    ):
-                        logging.debug(
-                            f"Skipping unchanged known file during initial scan: {file_path}"
-                        )
-                        processed_files_count += (
-                            1  # Count as "processed" in the sense of "checked"
-                        )
-                        continue
-
-                logging.debug(f"Initial scan: Processing file {file_path}")
-                if self._process_and_index_file(file_path):
-                    processed_files_count += 1
+        candidate_paths: Set[str] = set()
+        # Bounds the submitted-but-unprocessed files, so the walk stays only a
+        # little ahead of the workers
+        max_in_flight = self.scan_workers * SCAN_IN_FLIGHT_PER_WORKER
+        in_flight: "deque[Future[bool]]" = deque()
+
+        def collect_oldest():
+            nonlocal processed_files_count
+            processed_files_count += in_flight.popleft().result()
+            self.files_scanned += 1
+
+        with ThreadPoolExecutor(
+            max_workers=self.scan_workers, thread_name_prefix="initial-scan"
+        ) as executor:
+            for entry in self._iter_scan_candidates():
+                if self._stopping.is_set():
+                    break
+                candidate_paths.add(entry.path)
+                in_flight.append(executor.submit(self._scan_file, entry))
+                if len(in_flight) >= max_in_flight:
+                    collect_oldest()
+            while in_flight:
+                collect_oldest()
+        if self._stopping.is_set():
+            logging.info("Initial scan aborted: the file watcher is stopping.")
+            return
+
+        # Files recorded by a previous run that no longer exist (or are now ignored)
+        # were removed while the server was not watching
+        with self._known_files_lock:
+            stale_paths = [p for p in self.known_files if p not in candidate_paths]
+        for stale_path in stale_paths:
+            self.process_deletion(stale_path)
+
+        self._schedule_indexer_call(self.indexer.flush)
+        self.wait_for_indexing()
+        self.save_known_files()
         logging.info(
             f"Initial scan complete. Processed (checked or indexed) {processed_files_count} files."
         )
@@ -293,8 +1105,15 @@ class FileWatcher:
         """Handles file creation events."""
         if self._should_ignore(file_path):
             return
+        st = self._stat(file_path)
+        if st is None:
+            return
+        needs_reindex, file_hash = self._detect_change(file_path, st)
+        if not needs_reindex:
+            logging.debug(f"Created file {file_path} is already indexed and unchanged.")
+            return
         logging.info(f"File created: {file_path}. Processing for indexing.")
-        self._process_and_index_file(file_path)
+        self._process_and_index_file(file_path, st=st, file_hash=file_hash)
 
     def process_modification(self, file_path: str):
         """Handles file modification events."""
@@ -302,61 +1121,46 @@ class FileWatcher:
             return
 
         logging.debug(f"File modified event for: {file_path}")
-        current_hash = self._calculate_hash(file_path)
-        current_modified = self._get_last_modified(file_path)
-
-        if (
-            not current_hash
-        ):  # Hash calculation failed (e.g., file deleted quickly after modify event)
+        st = self._stat(file_path)
+        if st is None:  # File deleted quickly after the modify event
             logging.warning(
-                f"Hash calculation failed for modified file {file_path}. It might have been deleted. Removing if known."
+                f"Modified file {file_path} no longer exists. Removing if known."
             )
             if file_path in self.known_files:
                 self.process_deletion(file_path)  # Treat as deletion
             return
 
-        known_info = self.known_files.get(file_path)
-        needs_reindex = False
-        if not known_info:
+        if file_path not in self.known_files:
             logging.warning(
                 f"Modified event for a file not previously known: {file_path}. Processing as new creation."
             )
-            needs_reindex = True
-        elif (
-            current_hash != known_info["hash"]
-            or current_modified != known_info["last_modified"]
-        ):
-            logging.info(
-                f"Change detected in {file_path} (Hash or MTime mismatch). Re-indexing..."
-            )
-            needs_reindex = True
-        else:
-            logging.debug(
-                f"No significant change (hash and mtime match) detected for {file_path}. Skipping re-index."
+        needs_reindex, file_hash = self._detect_change(file_path, st)
+
+        if needs_reindex and not file_hash and file_path in self.known_files:
+            # Hash calculation failed (e.g., file deleted between stat and read)
+            logging.warning(
+                f"Hash calculation failed for modified file {file_path}. It might have been deleted. Removing if known."
             )
+            if file_path in self.known_files:
+                self.process_deletion(file_path)  # Treat as deletion
+            return
 
-        if needs_reindex:
-            try:
-                # Remove old version from index before adding new one
-                if self.indexer and self.event_loop:  # Check event_loop too
-                    # This ensures that if the number of chunks changes, old ones are gone.
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.indexer.remove_document(file_path), self.event_loop
-                    )
-                    # future.result(timeout=5) # Wait for removal before re-adding
-                    logging.debug(
-                        f"Scheduled removal of old document chunks for {file_path} before re-indexing. Future: {future}"
-                    )
-                else:
-                    logging.warning(
-                        f"Indexer not available. Cannot remove old chunks for modified file {file_path}."
-                    )
-                self._process_and_index_file(file_path)  # This will update known_files
-            except Exception as e:
-                logging.error(
-                    f"Error during re-indexing of modified file {file_path}: {e}",
-                    exc_info=True,
-                )
+        if not needs_reindex:
+            return
+
+        logging.info(
+            f"Change detected in {file_path} (size/mtime and hash mismatch). Re-indexing..."
+        )
+        try:
+            # Only chunks whose content changed are re-embedded; stale ones are removed
+            self._process_and_index_file(
+                file_path, st=st, file_hash=file_hash
+            )  # This will update known_files
+        except Exception as e:
+            logging.error(
+                f"Error during re-indexing of modified file {file_path}: {e}",
+                exc_info=True,
+            )
 
     def process_deletion(self, file_path: str):
         """Handles file deletion events."""
@@ -367,18 +1171,16 @@ class FileWatcher:
             )
             try:
                 if self.indexer and self.event_loop:  # Check event_loop too
-                    future = asyncio.run_coroutine_threadsafe(
-                        self.indexer.remove_document(file_path), self.event_loop
-                    )
-                    # future.result(timeout=5)
+                    self._queue_removal(file_path)
                     logging.debug(
-                        f"Scheduled remove_document for deleted file {file_path}. Future: {future}"
+                        f"Queued remove_document for deleted file {file_path}."
                     )
                 else:
                     logging.warning(
                         f"Indexer not available. Cannot remove index entries for deleted file {file_path}."
                     )
-                del self.known_files[file_path]
+                    with self._known_files_lock:
+                        self.known_files.pop(file_path, None)
             except Exception as e:
                 logging.error(
                     f"Error removing index entries or from known_files for deleted file {file_path}: {e}",
@@ -395,15 +1197,21 @@ class FileWatcher:
         """Starts the file system observer."""
         if not self.observer.is_alive():
             self.observer.schedule(
-                self.event_handler, self.project_path, recursive=True
+                self,
+                self.project_path,
+                recursive=True,
+                event_filter=WATCHED_EVENT_TYPES,
             )
+            self._start_event_worker()
             self.observer.start()
             logging.info(f"File watcher started for directory: {self.project_path}")
         else:
             logging.warning("File watcher start requested, but it is already running.")
 
     def stop(self):
-        """Stops the file system observer."""
+        """Stops the file system observer and aborts a running initial scan."""
+        self._stopping.set()
+        self._stop_event_worker()
         if self.observer.is_alive():
             self.observer.stop()
             self.observer.join(timeout=5)
@@ -415,45 +1223,120 @@ class FileWatcher:
                 logging.info("File watcher stopped successfully.")
         else:
             logging.info("File watcher stop requested, but it was not running.")
+        if self._stop_index_worker():
+            self.save_known_files()
+        else:
+            # Jobs are still pending; the state saved after the last completed scan stays
+            logging.warning("Not saving known files while indexing jobs are pending.")
 
+    def _start_event_worker(self):
+        """Starts the worker thread that processes queued file events."""
+        if self._event_worker is not None and self._event_worker.is_alive():
+            return
+        self._event_worker = threading.Thread(
+            target=self._run_event_worker, name="file-watcher-events", daemon=True
+        )
+        self._event_worker.start()
 
-class ProjectEventHandler(FileSystemEventHandler):
-    """
-    Handles file system events (created, modified, deleted, moved) from the
-    watchdog observer and delegates processing to the FileWatcher instance.
-    """
+    def _stop_event_worker(self):
+        """Stops the event worker thread. Events still queued are discarded."""
+        if self._event_worker is None:
+            return
+        self.event_queue.put(None)  # Sentinel: stop the worker
+        self._event_worker.join(timeout=5)
+        if self._event_worker.is_alive():
+            logging.warning("File watcher event worker did not stop cleanly.")
+        self._event_worker = None
+
+    @staticmethod
+    def _coalesce(previous: Optional[str], event_type: str) -> str:
+        """Merges a path's pending event with a newer one into the single action to take."""
+        if previous == "deleted" and event_type == "created":
+            return "modified"  # Replaced in place (e.g. atomic save): re-index
+        if previous == "created" and event_type == "modified":
+            return "created"
+        return event_type
 
-    def __init__(self, file_watcher: FileWatcher):
+    def _collect_batch(self) -> Optional[Dict[str, str]]:
         """
-        Initializes the event handler.
+        Blocks for the next event, then keeps draining until no event arrives for
+        `debounce_period` seconds or MAX_EVENT_BATCH events were read.
 
-        Args:
-            file_watcher: The FileWatcher instance that will process the events.
+        Returns:
+            The coalesced path -> event type mapping, or None once stopped.
         """
-        super().__init__()
-        self.file_watcher = file_watcher
-        logging.debug("ProjectEventHandler initialized.")
+        item = self.event_queue.get()
+        pending: Dict[str, str] = {}
+        received = 0
+        while item is not None:
+            event_type, path = item
+            pending[path] = self._coalesce(pending.get(path), event_type)
+            received += 1
+            if received >= MAX_EVENT_BATCH:
+                break
+            try:
+                item = self.event_queue.get(timeout=self.debounce_period)
+            except queue.Empty:
+                break
+        else:
+            return None  # Sentinel received
+        logging.debug(
+            f"Processing {len(pending)} paths coalesced from {received} file events."
+        )
+        return pending
+
+    def _run_event_worker(self):
+        """Event worker loop: processes coalesced event batches until stopped."""
+        handlers = {
+            "created": self.process_creation,
+            "modified": self.process_modification,
+            "deleted": self.process_deletion,
+        }
+        while (pending := self._collect_batch()) is not None:
+            for path, event_type in pending.items():
+                try:
+                    handlers[event_type](path)
+                except Exception as e:
+                    logging.error(
+                        f"Error handling {event_type} event for {path}: {e}",
+                        exc_info=True,
+                    )
+
+    def dispatch(self, event):
+        """
+        Drops file events for ignored paths (e.g. under .git/ or the LanceDB
+        directory) on the observer thread, before they are queued. Such events
+        would otherwise extend the debounce window and wake the event worker for
+        nothing; the index's own writes alone produce a steady stream of them.
+        """
+        if (
+            not event.is_directory
+            and self._should_ignore(event.src_path)
+            and (not event.dest_path or self._should_ignore(event.dest_path))
+        ):
+            return
+        super().dispatch(event)
 
     def on_created(self, event):
         """Called when a file or directory is created."""
         super().on_created(event)
         if not event.is_directory:
             logging.debug(f"Event: created file {event.src_path}")
-            self.file_watcher.process_creation(event.src_path)
+            self.event_queue.put(("created", event.src_path))
 
     def on_modified(self, event):
         """Called when a file or directory is modified."""
         super().on_modified(event)
         if not event.is_directory:
             logging.debug(f"Event: modified file {event.src_path}")
-            self.file_watcher.process_modification(event.src_path)
+            self.event_queue.put(("modified", event.src_path))
 
     def on_deleted(self, event):
         """Called when a file or directory is deleted."""
         super().on_deleted(event)
         if not event.is_directory:
             logging.debug(f"Event: deleted file {event.src_path}")
-            self.file_watcher.process_deletion(event.src_path)
+            self.event_queue.put(("deleted", event.src_path))
 
     def on_moved(self, event):
         """Called when a file or directory is moved or renamed."""
@@ -461,8 +1344,8 @@ class ProjectEventHandler(FileSystemEventHandler):
         # A move is treated as a deletion of the source and a creation of the destination.
         logging.debug(f"Event: moved {event.src_path} -> {event.dest_path}")
         if not event.is_directory:
-            self.file_watcher.process_deletion(event.src_path)
-            self.file_watcher.process_creation(event.dest_path)
+            self.event_queue.put(("deleted", event.src_path))
+            self.event_queue.put(("created", event.dest_path))
         else:
             # Handling directory moves can be complex. A simple approach is to
             # trigger a re-scan or more granularly process files within.
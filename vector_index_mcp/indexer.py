@@ -1,14 +1,26 @@
 import asyncio
 import logging
-from typing import List, Optional, TypedDict
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
 
 import lancedb
 import numpy as np
+import pyarrow as pa
 import sentence_transformers
+import xxhash
 from lancedb.db import AsyncConnection  # For type hinting
+from lancedb.index import BTree, IvfPq
 from lancedb.table import AsyncTable  # For type hinting
 
 from .models import (
+    EMBEDDING_DIM,
     IndexedDocument,
     Settings,
 )
@@ -17,6 +29,199 @@ log = logging.getLogger(
     __name__
 )  # BasicConfig should be handled at the application entry point (main_mcp.py)
 
+# Buffered rows are appended to the table once at least this many are pending
+WRITE_BUFFER_MAX_ROWS = 1024
+
+# Embeddings are L2-normalized (see generate_embeddings), so the dot product
+# ranks like cosine similarity without its per-pair norm computations
+DISTANCE_TYPE = "dot"
+
+# Below this many rows, a brute-force vector search beats building and probing an ANN index
+VECTOR_INDEX_MIN_ROWS = 10_000
+
+# Embeddings of this many recent search queries are kept; unlike search results,
+# they stay valid across index writes
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+# Float32 rounding can put the dot product of a normalized embedding with itself
+# slightly below 1, so similarity thresholds are compared with this tolerance
+SIMILARITY_TOLERANCE = 1e-5
+
+# The embedding cache table is compacted, and its key index updated, after this
+# many writes, so lookups do not slow down as small write fragments pile up
+EMBEDDING_CACHE_OPTIMIZE_WRITES = 64
+# Once the embedding cache holds more than this many times the table's rows (and at
+# least EMBEDDING_CACHE_MIN_ROWS), embeddings of texts no longer indexed are dropped
+EMBEDDING_CACHE_MAX_ROWS_FACTOR = 2
+EMBEDDING_CACHE_MIN_ROWS = 10_000
+# Keys per delete statement when pruning the embedding cache
+EMBEDDING_CACHE_PRUNE_BATCH = 1000
+# Versions of the embedding cache table older than this are deleted when it is
+# optimized; unlike the index's, they are never read again
+EMBEDDING_CACHE_KEEP_VERSIONS = timedelta(minutes=1)
+
+# Loaded embedding models, shared by all Indexer instances in the process
+_models: Dict[Tuple[str, bool], sentence_transformers.SentenceTransformer] = {}
+_models_lock = threading.Lock()
+
+
+def _load_shared_model(
+    model_name: str, compile_model: bool
+) -> sentence_transformers.SentenceTransformer:
+    """
+    Returns the process-wide instance of the given embedding model, loading it on
+    first use. On CUDA the model runs in half precision; with `compile_model`, its
+    transformer is compiled with torch.compile. A warmup encode pays the first-call
+    (and compile) cost here, at startup, rather than on the first request.
+    """
+    key = (model_name, compile_model)
+    with _models_lock:
+        model = _models.get(key)
+        if model is not None:
+            return model
+        model = sentence_transformers.SentenceTransformer(model_name)
+        if model.device.type == "cuda":
+            model.half()
+        if compile_model:
+            try:
+                import torch
+
+                transformer = model._first_module()
+                transformer.auto_model = torch.compile(transformer.auto_model)
+            except Exception as e:
+                log.warning(
+                    f"Indexer: torch.compile failed for model '{model_name}'; using it uncompiled: {e}"
+                )
+        model.encode(["warmup"], show_progress_bar=False)
+        _models[key] = model
+        return model
+
+
+def _sql_equals(column: str, value: str) -> str:
+    """
+    Builds a `column = 'value'` LanceDB filter, escaping the value as a SQL
+    string literal. All filters on user-controlled strings, such as file and
+    project paths, go through this helper.
+    """
+    escaped = value.replace("'", "''")
+    return f"{column} = '{escaped}'"
+
+
+@dataclass
+class _WriteBuffer:
+    """
+    Rows waiting to be appended to the LanceDB table, kept as Arrow tables that
+    share the table's schema so a flush is a single concatenation and `add`.
+    """
+
+    tables: List[pa.Table] = field(default_factory=list)
+    num_rows: int = 0
+
+
+class _SearchCache:
+    """
+    Least-recently-used cache of search results whose entries expire after `ttl`
+    seconds. Keys include the index version, so results computed before a write
+    to the index are never served after it. Thread-safe, as the cache can be
+    invalidated from the file watcher's threads.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, list]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[list]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple[Any, ...], value: list):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _SemanticSearchCache:
+    """
+    Search results of recent queries, looked up by query embedding rather than
+    query text: a query whose (normalized) embedding has a dot product of at least
+    `threshold` with a cached query's, at the same top_k, reuses its results and
+    skips the vector search. Embeddings are kept in one matrix, so a lookup is a
+    single matrix-vector product. Entries expire after `ttl` seconds, and all of
+    them are dropped when the index version changes. A `threshold` of None
+    disables the cache. Thread-safe.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, threshold: Optional[float]):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._embeddings: Optional[np.ndarray] = (
+            None  # (maxsize, dim), allocated on first put
+        )
+        self._entries: List[Optional[Tuple[int, float, list]]] = [
+            None
+        ] * maxsize  # (top_k, expires_at, results)
+        self._next_slot = 0  # Ring buffer position: the oldest entry is overwritten
+        self._index_version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, embedding: np.ndarray, top_k: int) -> Optional[list]:
+        with self._lock:
+            if self._embeddings is None or self.threshold is None:
+                return None
+            scores = self._embeddings @ embedding
+            now = time.monotonic()
+            for slot in np.argsort(scores)[::-1]:
+                if scores[slot] < self.threshold - SIMILARITY_TOLERANCE:
+                    return None
+                entry = self._entries[slot]
+                if entry is not None and entry[0] == top_k and entry[1] > now:
+                    return entry[2]
+            return None
+
+    def put(self, index_version: int, embedding: np.ndarray, top_k: int, value: list):
+        if self.maxsize <= 0 or self.threshold is None:
+            return
+        with self._lock:
+            # Results computed against an older index version are stale
+            if index_version != self._index_version:
+                return
+            if self._embeddings is None:
+                self._embeddings = np.zeros(
+                    (self.maxsize, embedding.shape[0]), dtype=np.float32
+                )
+            slot = self._next_slot
+            self._embeddings[slot] = embedding
+            self._entries[slot] = (top_k, time.monotonic() + self.ttl, value)
+            self._next_slot = (slot + 1) % self.maxsize
+
+    def clear(self, index_version: int):
+        with self._lock:
+            self._index_version = index_version
+            self._entries = [None] * self.maxsize
+            if self._embeddings is not None:
+                self._embeddings[:] = 0
+            self._next_slot = 0
+
 
 class FileMetadataDict(TypedDict):
     """
@@ -35,6 +240,7 @@ class SearchResultDict(TypedDict):
 
     document_id: str
     file_path: str
+    project_path: str
     content_hash: str
     last_modified_timestamp: float
     chunk_index: int
@@ -45,6 +251,10 @@ class SearchResultDict(TypedDict):
     # score: float # Optional: Include score if returned by search method
 
 
+# Table columns returned by Indexer.search, in SearchResultDict order
+SEARCH_RESULT_COLUMNS = list(SearchResultDict.__annotations__)
+
+
 class Indexer:
     """
     Manages the vector index, including loading embedding models,
@@ -66,6 +276,44 @@ class Indexer:
         self.db: Optional[AsyncConnection] = None
         self.table: Optional[AsyncTable] = None
         self.table_name = "documents"  # Name of the table in LanceDB
+        # Side table of previously computed embeddings (see _embed)
+        self.embedding_cache_table: Optional[AsyncTable] = None
+        self.embedding_cache_table_name = "embedding_cache"
+        # Writes to the embedding cache table since it was last optimized
+        self._embedding_cache_writes = 0
+        # Serializes the writes, so each sees the keys inserted by the previous one
+        self._embedding_cache_write_lock = asyncio.Lock()
+        # True if load_resources created the table from scratch rather than opening an existing one
+        self.table_was_created = False
+        # Rows added via add_or_update_documents that are not yet written to the table
+        self._write_buffer = _WriteBuffer()
+        # Bumped on every write to the table; part of the search cache key
+        self._index_version = 0
+        # Table row counts by filter clause ("" for none), as (index version, count)
+        self._count_cache: Dict[str, Tuple[int, int]] = {}
+        # Index version at the last optimize_indices run
+        self._optimized_version: Optional[int] = None
+        # Model calls are CPU-bound and run here, so the event loop stays responsive
+        # (e.g. to status requests) while chunks or queries are embedded
+        self._embedding_executor = ThreadPoolExecutor(
+            max_workers=settings.embedding_threads, thread_name_prefix="embedding"
+        )
+        self._search_cache = _SearchCache(
+            settings.search_cache_size, settings.search_cache_ttl
+        )
+        # Query embeddings by normalized query text, least recently used first.
+        # Only touched from the event loop, so it needs no lock.
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.query_embedding_cache_hits = 0
+        self.query_embedding_cache_misses = 0
+        self._semantic_search_cache = _SemanticSearchCache(
+            settings.search_cache_size,
+            settings.search_cache_ttl,
+            settings.search_similarity_threshold,
+        )
+        # Number of buffer flushes that failed, dropping their rows. Lets callers that
+        # track what was buffered notice losses, including those of flushes they did not run.
+        self.write_failures = 0
 
     async def load_resources(self, recreate_if_exists: bool = False):
         """
@@ -82,17 +330,21 @@ class Indexer:
             Exception: Propagates exceptions from underlying libraries during resource loading.
         """
         log.info("Indexer: Starting to load resources (model and database).")
+        self.invalidate_search_cache()
         self.table = None  # Initialize self.table
+        self._write_buffer = _WriteBuffer()
+        self.table_was_created = False
 
         # Load Sentence Transformer Model
         try:
             log.info(
                 f"Indexer: Loading sentence transformer model '{self.settings.embedding_model_name}'..."
             )
-            # Model loading is CPU-bound, consider to_thread if it becomes a bottleneck
-            # For now, direct call as it's usually part of startup.
-            self.model = sentence_transformers.SentenceTransformer(
-                self.settings.embedding_model_name
+            # Loading (and warming up) the model is CPU-bound; keep it off the event loop
+            self.model = await asyncio.to_thread(
+                _load_shared_model,
+                self.settings.embedding_model_name,
+                self.settings.embedding_compile,
             )
             log.debug(
                 f"Indexer: Model '{self.settings.embedding_model_name}' loaded. Type: {type(self.model)}."
@@ -139,7 +391,14 @@ class Indexer:
                 log.info(f"Attempting to open existing table: {self.table_name}")
                 try:
                     opened_table = await self.db.open_table(self.table_name)
-                    if opened_table:
+                    if opened_table and not (await opened_table.schema()).equals(
+                        IndexedDocument.to_arrow_schema()
+                    ):
+                        # E.g. a table written with fp32 vectors by an older version
+                        log.warning(
+                            f"Existing table '{self.table_name}' has an outdated schema. It will be recreated and re-indexed."
+                        )
+                    elif opened_table:
                         self.table = opened_table
                         log.info(
                             f"Successfully opened existing table: {self.table_name}. self.table: {self.table}, type: {type(self.table)}"
@@ -176,6 +435,7 @@ class Indexer:
                         f"Successfully created/overwritten and assigned table '{self.table_name}'. self.table: {self.table}"
                     )
                     table_created_successfully = True
+                    self.table_was_created = True
                 else:
                     log.error(
                         f"CRITICAL: Async db.create_table for '{self.table_name}' did not return a valid AsyncTable object. Returned: {created_table_obj}"
@@ -191,27 +451,16 @@ class Indexer:
                 f"Fatal error initializing table '{self.table_name}'"
             ) from e
 
-        # Index creation logic
-        MIN_ROWS_FOR_DEFAULT_INDEX = 256  # Default for IVF_PQ, adjust if necessary
+        # The vector index is built or updated by optimize_indices after each project scan
         if self.table and isinstance(self.table, AsyncTable):
             if table_opened_successfully and not table_created_successfully:
                 num_rows = await self.table.count_rows()
                 log.info(
                     f"Table '{self.table_name}' was opened and contains {num_rows} rows."
                 )
-                if num_rows >= MIN_ROWS_FOR_DEFAULT_INDEX:
-                    log.info(
-                        f"Sufficient data ({num_rows} >= {MIN_ROWS_FOR_DEFAULT_INDEX}) for default index creation. Ensuring vector index exists (replace=True)."
-                    )
-                    await self.create_vector_index(table_obj=self.table, replace=True)
-                else:
-                    log.warning(
-                        f"Table '{self.table_name}' has only {num_rows} rows, which is less than the required {MIN_ROWS_FOR_DEFAULT_INDEX} "
-                        f"for default index creation. Index creation will be deferred or a flat index might be considered later."
-                    )
             elif table_created_successfully:
                 log.info(
-                    f"Table '{self.table_name}' was newly created/overwritten. Vector index creation will be handled upon data addition or explicit trigger."
+                    f"Table '{self.table_name}' was newly created/overwritten. Vector index creation will be handled after the project scan."
                 )
             # If neither, self.table might be None or invalid, which is handled by the else below.
         else:
@@ -219,10 +468,76 @@ class Indexer:
             log.error(final_error_msg)
             raise RuntimeError(final_error_msg)
 
+        # Used by per-project counts and deletes
+        await self._ensure_scalar_index(self.table, self.table_name, "project_path")
+
+        if self.settings.embedding_cache:
+            await self._open_embedding_cache()
+
         log.info(
             "Indexer: Model and database table loaded and initialized. Vector index creation may be deferred for new or small tables."
         )
 
+    async def _ensure_scalar_index(
+        self, table: AsyncTable, table_name: str, column: str
+    ):
+        """
+        Creates a scalar (BTree) index on `column` of `table`, if it does not exist
+        yet. Without it, filters on the column still work, by scanning it, so
+        failures are only logged.
+        """
+        try:
+            indices = await table.list_indices()
+            if any(index.columns == [column] for index in indices):
+                return
+            await table.create_index(column, config=BTree())
+            log.info(
+                f"Indexer: Created scalar index on '{column}' for table '{table_name}'."
+            )
+        except Exception as e:
+            log.warning(
+                f"Indexer: Could not create the scalar index on '{column}' for table '{table_name}': {e}",
+                exc_info=True,
+            )
+
+    async def _open_embedding_cache(self):
+        """
+        Opens the embedding cache table, creating it if it does not exist or has an
+        outdated schema. The cache is an optimization only: if it cannot be opened,
+        a warning is logged and embeddings are always computed.
+        """
+        self.embedding_cache_table = None
+        schema = pa.schema(
+            [
+                pa.field("key", pa.string()),
+                pa.field("vector", pa.list_(pa.float16(), EMBEDDING_DIM)),
+            ]
+        )
+        try:
+            try:
+                cache_table = await self.db.open_table(self.embedding_cache_table_name)
+                if not (await cache_table.schema()).equals(schema):
+                    cache_table = None
+            except Exception:  # Not found
+                cache_table = None
+            if cache_table is None:
+                cache_table = await self.db.create_table(
+                    self.embedding_cache_table_name, schema=schema, mode="overwrite"
+                )
+            # Lookups filter on `key`
+            await self._ensure_scalar_index(
+                cache_table, self.embedding_cache_table_name, "key"
+            )
+            self.embedding_cache_table = cache_table
+            log.info(
+                f"Indexer: Embedding cache table '{self.embedding_cache_table_name}' is ready."
+            )
+        except Exception as e:
+            log.warning(
+                f"Indexer: Could not open the embedding cache table '{self.embedding_cache_table_name}'; embeddings will not be cached: {e}",
+                exc_info=True,
+            )
+
     async def create_vector_index(self, table_obj: AsyncTable, replace: bool = False):
         """
         Creates a vector search index on the 'vector' column of the provided async table object.
@@ -254,10 +569,16 @@ class Indexer:
             log.info(
                 f"Indexer: Attempting to create vector index on table '{table_name_for_log}' (column 'vector', replace={replace})."
             )
-            # Parameters like num_partitions, num_sub_vectors can be tuned for performance vs. accuracy.
-            # Default IVF_PQ index is generally a good starting point.
+            # About sqrt(N) partitions balances partition count against partition size;
+            # 8 dimensions per PQ sub-vector keeps recall high for small embeddings.
+            num_rows = await table_obj.count_rows()
+            config = IvfPq(
+                distance_type=DISTANCE_TYPE,
+                num_partitions=max(1, int(math.sqrt(num_rows))),
+                num_sub_vectors=EMBEDDING_DIM // 8 if EMBEDDING_DIM % 8 == 0 else None,
+            )
             await table_obj.create_index(
-                "vector", replace=replace
+                "vector", replace=replace, config=config
             )  # Pass column name as first arg
             log.info(
                 f"Indexer: Successfully created/verified vector index on table '{table_name_for_log}'."
@@ -272,10 +593,111 @@ class Indexer:
                 f"Failed to create vector index on table '{table_name_for_log}': {index_e}"
             ) from index_e
 
+    async def optimize_indices(self):
+        """
+        Brings the table's indices up to date; called after each project scan.
+        Once the table holds `VECTOR_INDEX_MIN_ROWS` rows, the vector index is
+        built (or rebuilt, if it uses another distance type). Otherwise rows
+        written since the indices were built are added to them with `optimize`,
+        which also compacts the table's files. Does nothing if the table has not
+        changed since the last run. Failures are logged, not raised: searches and
+        filters work without up-to-date indices, only slower.
+        """
+        if not self.table or self._optimized_version == self._index_version:
+            return
+        await self._flush_before_read()
+        index_version = self._index_version
+        try:
+            num_rows = await self.table.count_rows()
+            vector_index = next(
+                (
+                    index
+                    for index in await self.table.list_indices()
+                    if index.columns == ["vector"]
+                ),
+                None,
+            )
+            if vector_index is None:
+                rebuild = num_rows >= VECTOR_INDEX_MIN_ROWS
+            else:
+                stats = await self.table.index_stats(vector_index.name)
+                rebuild = stats.distance_type != DISTANCE_TYPE
+            if rebuild:
+                await self.create_vector_index(self.table, replace=True)
+            else:
+                await self.table.optimize()
+            self._optimized_version = index_version
+            log.info(
+                f"Indexer: Indices of table '{self.table_name}' are up to date ({num_rows} rows)."
+            )
+        except Exception as e:
+            log.warning(
+                f"Indexer: Could not optimize the indices of table '{self.table_name}': {e}",
+                exc_info=True,
+            )
+        await self._optimize_embedding_cache()
+
+    async def _optimize_embedding_cache(self):
+        """
+        Keeps the embedding cache table small and fast to look up. If it has grown
+        past `EMBEDDING_CACHE_MAX_ROWS_FACTOR` times the table's rows, the
+        embeddings of texts no longer in the table (deleted or edited chunks, or
+        another model's) are dropped. Then its files are compacted and its key
+        index updated. Failures are logged, not raised.
+        """
+        cache_table = self.embedding_cache_table
+        if cache_table is None or not self.table:
+            return
+        self._embedding_cache_writes = 0
+        try:
+            cache_rows = await cache_table.count_rows()
+            max_rows = max(
+                EMBEDDING_CACHE_MIN_ROWS,
+                EMBEDDING_CACHE_MAX_ROWS_FACTOR * await self.table.count_rows(),
+            )
+            if cache_rows > max_rows:
+                texts = await (
+                    self.table.query().select(["extracted_text_chunk"]).to_arrow()
+                )
+                live_keys = {
+                    self._embedding_key(text)
+                    for text in texts.column("extracted_text_chunk").to_pylist()
+                }
+                cached_keys = await cache_table.query().select(["key"]).to_arrow()
+                stale_keys = [
+                    key
+                    for key in cached_keys.column("key").to_pylist()
+                    if key not in live_keys
+                ]
+                for start in range(0, len(stale_keys), EMBEDDING_CACHE_PRUNE_BATCH):
+                    batch = stale_keys[start : start + EMBEDDING_CACHE_PRUNE_BATCH]
+                    key_list = ", ".join(f"'{key}'" for key in batch)
+                    await cache_table.delete(f"key IN ({key_list})")
+                log.info(
+                    f"Indexer: Dropped {len(stale_keys)} of {cache_rows} embeddings from the embedding cache."
+                )
+            await cache_table.optimize(cleanup_older_than=EMBEDDING_CACHE_KEEP_VERSIONS)
+        except Exception as e:
+            log.warning(
+                f"Indexer: Could not optimize the embedding cache table '{self.embedding_cache_table_name}': {e}",
+                exc_info=True,
+            )
+
+    def invalidate_search_cache(self):
+        """
+        Drops all cached search results. Called after every write to the table;
+        results computed concurrently with a write are keyed by the old index
+        version and can no longer be served either.
+        """
+        self._index_version += 1
+        self._search_cache.clear()
+        self._semantic_search_cache.clear(self._index_version)
+
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generates a vector embedding for the given text using the loaded sentence transformer model.
-        Ensures the embedding is a float32 numpy array.
+        Ensures the embedding is a float32 numpy array. Thin wrapper around the
+        batched `generate_embeddings`.
 
         Args:
             text: The input text to embed.
@@ -288,21 +710,43 @@ class Indexer:
             Exception: Propagates exceptions from the embedding model.
         """
         log.debug(f"Indexer: Generating embedding for text snippet: '{text[:100]}...'")
+        return self.generate_embeddings([text])[0]
+
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Generates vector embeddings for a batch of texts. The model encodes them in
+        batches of `embedding_batch_size`, so one forward pass covers many texts
+        instead of one per text.
+
+        Args:
+            texts: The input texts to embed.
+
+        Returns:
+            A 2-D float32 numpy array with one embedding row per input text.
+
+        Raises:
+            RuntimeError: If the embedding model is not loaded.
+            Exception: Propagates exceptions from the embedding model.
+        """
+        log.debug(f"Indexer: Generating embeddings for a batch of {len(texts)} texts.")
         if self.model is None:
             # This should ideally be caught earlier during load_resources or by checks in calling methods.
             log.critical(
-                "Indexer: Embedding model (self.model) is None when generate_embedding was called. This is a critical state."
+                "Indexer: Embedding model (self.model) is None when generate_embeddings was called. This is a critical state."
             )
             raise RuntimeError(
-                "Embedding model is not loaded. Cannot generate embedding."
+                "Embedding model is not loaded. Cannot generate embeddings."
             )
         try:
-            embedding = self.model.encode(
-                text, normalize_embeddings=True
-            )  # Normalizing is often good for cosine similarity
-            return embedding.astype(
-                np.float32
-            )  # Ensure float32 for compatibility with LanceDB/Arrow
+            embeddings = self.model.encode(
+                texts,
+                batch_size=self.settings.embedding_batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True,  # Required by DISTANCE_TYPE
+            )
+            # Ensure float32 for compatibility with LanceDB/Arrow
+            return np.asarray(embeddings, dtype=np.float32)
         except AttributeError as ae:
             # This might happen if self.model is not a valid SentenceTransformer object despite not being None.
             log.error(
@@ -312,48 +756,316 @@ class Indexer:
             raise
         except Exception as e:
             log.error(
-                f"Indexer: Failed to generate embedding for text snippet '{text[:100]}...': {e}",
+                f"Indexer: Failed to generate embeddings for a batch of {len(texts)} texts: {e}",
                 exc_info=True,
             )
             raise  # Re-raise to allow caller to handle.
 
-    async def add_or_update_document(self, doc: IndexedDocument):
+    async def _encode(self, texts: List[str]) -> np.ndarray:
+        """Runs `generate_embeddings` on the embedding executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._embedding_executor, self.generate_embeddings, texts
+        )
+
+    async def _embed_queries(self, query_texts: List[str]) -> np.ndarray:
+        """
+        Embeds search queries, reusing the embeddings of recently seen queries.
+        Queries are keyed with runs of whitespace collapsed, which the tokenizer
+        ignores anyway; case is kept, as models may be cased. The uncached queries
+        are embedded in one model call.
+        """
+        keys = [" ".join(query_text.split()) for query_text in query_texts]
+        cache = self._query_embeddings
+        # Taken before awaiting the model, during which other searches may evict entries
+        found = {key: cache[key] for key in keys if key in cache}
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        self.query_embedding_cache_hits += len(keys) - len(missing)
+        self.query_embedding_cache_misses += len(missing)
+        if missing:
+            found.update(zip(missing, await self._encode(missing)))
+        for key, embedding in found.items():
+            cache[key] = embedding
+            cache.move_to_end(key)
+        while len(cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            cache.popitem(last=False)
+        return np.stack([found[key] for key in keys])
+
+    def close(self):
+        """Releases the embedding threads. Pending model calls still complete."""
+        self._embedding_executor.shutdown(wait=False)
+
+    def _embedding_key(self, text: str) -> str:
+        """Key of a text's embedding in the embedding cache; covers the model, too."""
+        return xxhash.xxh3_128_hexdigest(
+            f"{self.settings.embedding_model_name}\0{text}".encode("utf-8")
+        )
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
         """
-        Adds or updates a single document chunk (represented by an IndexedDocument object)
-        into the LanceDB table. This involves generating an embedding for the text chunk.
+        Returns fp16 embeddings for `texts`. Texts found in the embedding cache are
+        not embedded again; the rest (each distinct text once) are embedded in one
+        batched call and added to the cache.
+        """
+        vectors = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float16)
+        if not texts:
+            return vectors
+        cache_table = self.embedding_cache_table
+        if cache_table is None:
+            vectors[:] = await self._encode(texts)
+            return vectors
 
-        Note: LanceDB's `add` with LanceModels typically handles upserts based on primary keys
-        if defined in the model, or simply adds if no such concept is used for replacement.
-        For explicit updates, one might need to delete then add. Here, we assume `add` is sufficient
-        or that upstream logic handles de-duplication/updates by removing old versions first.
+        keys = [self._embedding_key(text) for text in texts]
+        cached = {}
+        try:
+            key_list = ", ".join(f"'{key}'" for key in set(keys))
+            hits = await (
+                cache_table.query()
+                .where(f"key IN ({key_list})")
+                .select(["key", "vector"])
+                .to_arrow()
+            )
+            hit_vectors = (
+                hits.column("vector")
+                .combine_chunks()
+                .flatten()
+                .to_numpy()
+                .reshape(-1, EMBEDDING_DIM)
+            )
+            cached = dict(zip(hits.column("key").to_pylist(), hit_vectors))
+        except Exception as e:
+            log.warning(f"Indexer: Embedding cache lookup failed: {e}")
+
+        # Distinct texts missing from the cache, by key
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                misses.setdefault(key, text)
+        if misses:
+            miss_vectors = (await self._encode(list(misses.values()))).astype(
+                np.float16
+            )
+            cached.update(zip(misses, miss_vectors))
+            try:
+                # Another batch may have cached some of the same texts meanwhile
+                async with self._embedding_cache_write_lock:
+                    await (
+                        cache_table.merge_insert("key")
+                        .when_not_matched_insert_all()
+                        .execute(
+                            pa.table(
+                                {
+                                    "key": pa.array(list(misses), pa.string()),
+                                    "vector": pa.FixedSizeListArray.from_arrays(
+                                        pa.array(miss_vectors.ravel()), EMBEDDING_DIM
+                                    ),
+                                }
+                            )
+                        )
+                    )
+                    self._embedding_cache_writes += 1
+                    if self._embedding_cache_writes >= EMBEDDING_CACHE_OPTIMIZE_WRITES:
+                        self._embedding_cache_writes = 0
+                        await cache_table.optimize(
+                            cleanup_older_than=EMBEDDING_CACHE_KEEP_VERSIONS
+                        )
+            except Exception as e:
+                log.warning(f"Indexer: Could not add embeddings to the cache: {e}")
+        log.debug(
+            f"Indexer: Embedded {len(misses)} of {len(texts)} texts; the rest came from the embedding cache."
+        )
+        for i, key in enumerate(keys):
+            vectors[i] = cached[key]
+        return vectors
+
+    async def _to_arrow(self, docs: List[IndexedDocument]) -> pa.Table:
+        """
+        Converts documents into an Arrow table matching the `IndexedDocument` schema.
+        Documents without a vector are embedded, all in one batched call (see _embed).
+        The table is built column by column from the documents' attributes, without
+        serializing each document to a dict first. Vectors are cast to fp16 in NumPy
+        and handed to Arrow as one flat buffer, rather than as per-row Python float lists.
+        """
+        missing = [i for i, doc in enumerate(docs) if doc.vector is None]
+        vectors = np.empty((len(docs), EMBEDDING_DIM), dtype=np.float16)
+        if missing:
+            vectors[missing] = await self._embed(
+                [docs[i].extracted_text_chunk for i in missing]
+            )
+        for i, doc in enumerate(docs):
+            if doc.vector is not None:
+                vectors[i] = doc.vector
+
+        schema = IndexedDocument.to_arrow_schema()
+        vector_index = schema.get_field_index("vector")
+        scalar_fields = list(schema.remove(vector_index))
+        # One attrgetter call per document, transposed into per-column value tuples
+        rows = map(attrgetter(*(f.name for f in scalar_fields)), docs)
+        column_values = list(zip(*rows)) or [()] * len(scalar_fields)
+        columns = []
+        for schema_field, values in zip(scalar_fields, column_values):
+            if pa.types.is_struct(schema_field.type):  # Nested model, e.g. metadata
+                values = [dict(value) for value in values]
+            columns.append(pa.array(values, type=schema_field.type))
+        columns.insert(
+            vector_index,
+            pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), EMBEDDING_DIM),
+        )
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    async def add_or_update_documents(self, docs: List[IndexedDocument]):
+        """
+        Adds or updates a batch of document chunks in the LanceDB table. The texts of
+        all chunks that have no vector yet are embedded in one batched model call,
+        and the resulting rows are appended to a write buffer. The buffer is written
+        with a single `table.add` once it holds `WRITE_BUFFER_MAX_ROWS` rows, or when
+        `flush` is called. Returning without an error therefore does not mean the
+        rows were written; only a successful `flush` does.
+
+        Note: LanceDB's `add` appends rows; upstream logic handles updates by removing
+        old versions of a file's chunks first.
 
         Args:
-            doc: An `IndexedDocument` object containing the data for the chunk.
-                 The `vector` field will be populated by this method.
+            docs: `IndexedDocument` objects containing the data for the chunks.
+                  Missing `vector` fields will be populated by this method.
+
+        Raises:
+            RuntimeError: If the table is not initialized.
+            Exception: Propagates errors from embedding the chunks or from a
+                       flush triggered by a full buffer, after logging them.
         """
+        if not docs:
+            return
         if not self.table:
+            err_msg = f"Indexer: Cannot add {len(docs)} document chunks; table is not initialized."
+            log.error(err_msg)
+            raise RuntimeError(err_msg)
+
+        try:
+            rows = await self._to_arrow(docs)
+        except Exception as e:
+            log.error(
+                f"Indexer: Error embedding {len(docs)} document chunks (first ID: {docs[0].document_id}, file: {docs[0].file_path}): {e}",
+                exc_info=True,
+            )
+            raise
+        self._write_buffer.tables.append(rows)
+        self._write_buffer.num_rows += rows.num_rows
+        log.debug(
+            f"Indexer: Buffered {len(docs)} document chunks (first ID: {docs[0].document_id}); {self._write_buffer.num_rows} rows pending."
+        )
+        if self._write_buffer.num_rows >= WRITE_BUFFER_MAX_ROWS:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Appends all buffered rows to the LanceDB table with a single `table.add`.
+        Called automatically when the buffer is full and before any other write or
+        read of the table, so callers never observe the table without rows they
+        already added.
+
+        Raises:
+            Exception: Propagates the error of a failed `table.add`, after logging it.
+                       The buffered rows are dropped and `write_failures` is incremented.
+        """
+        buffer = self._write_buffer
+        if not buffer.num_rows or not self.table:
+            return
+        # Swap the buffer out first so adds arriving during the await start a new one
+        self._write_buffer = _WriteBuffer()
+        try:
+            await self.table.add(pa.concat_tables(buffer.tables))
+            log.debug(f"Indexer: Flushed {buffer.num_rows} buffered rows to the table.")
+        except Exception as e:
+            self.write_failures += 1
             log.error(
-                f"Indexer: Cannot add document '{doc.document_id}'; table is not initialized."
+                f"Indexer: Error writing {buffer.num_rows} buffered rows to the table: {e}",
+                exc_info=True,
             )
-            return  # Or raise an error
+            raise
+        finally:
+            self.invalidate_search_cache()
 
+    async def _flush_before_read(self):
+        """
+        Flushes the write buffer ahead of a read. A failed flush is already logged
+        and recorded in `write_failures`, so the read goes ahead on the rows that
+        were written instead of failing too.
+        """
         try:
-            vector_embedding = self.generate_embedding(doc.extracted_text_chunk)
-            # Pydantic V2 uses model_copy, V1 uses copy. Assuming V1 for .copy()
-            doc_with_vector = doc.copy(update={"vector": vector_embedding.tolist()})
+            await self.flush()
+        except Exception:
+            pass
+
+    async def update_document_chunks(
+        self,
+        file_path: str,
+        changed_docs: List[IndexedDocument],
+        total_chunks: int,
+        content_hash: str,
+        last_modified_timestamp: float,
+    ):
+        """
+        Incrementally updates the indexed chunks of a modified file. Only the chunks
+        whose text changed are embedded and upserted (matched on `document_id`);
+        chunks beyond the file's new chunk count are deleted, and the file-level
+        columns of the unchanged chunks are refreshed in place without re-embedding.
+        The steps run in order within this one coroutine.
 
-            await self.table.add(
-                [doc_with_vector]
-            )  # Add as a list containing the single Pydantic object
+        Args:
+            file_path: The path of the modified file.
+            changed_docs: The new or changed chunks of the file. Their `vector`
+                          fields will be populated by this method.
+            total_chunks: The file's new number of chunks.
+            content_hash: The file's new content hash.
+            last_modified_timestamp: The file's new modification time.
+
+        Raises:
+            RuntimeError: If the table is not initialized.
+            Exception: Propagates errors from any of the steps after logging them,
+                       so the caller can retry the update.
+        """
+        if not self.table:
+            err_msg = f"Indexer: Cannot update chunks for '{file_path}'; table is not initialized."
+            log.error(err_msg)
+            raise RuntimeError(err_msg)
+        await self.flush()
+
+        file_condition = _sql_equals("file_path", file_path)
+        try:
+            if changed_docs:
+                rows = await self._to_arrow(changed_docs)
+                await (
+                    self.table.merge_insert("document_id")
+                    .when_matched_update_all()
+                    .when_not_matched_insert_all()
+                    .execute(rows)
+                )
+            # Drop chunks the file no longer has (it got shorter)
+            await self.table.delete(
+                f"{file_condition} AND chunk_index >= {total_chunks}"
+            )
+            # Unchanged chunks keep their text and vector; only file-level columns change
+            await self.table.update(
+                {
+                    "total_chunks": total_chunks,
+                    "content_hash": content_hash,
+                    "last_modified_timestamp": last_modified_timestamp,
+                },
+                where=file_condition,
+            )
             log.debug(
-                f"Indexer: Successfully added/updated document chunk ID: {doc.document_id}, file: {doc.file_path}"
+                f"Indexer: Updated '{file_path}': re-embedded {len(changed_docs)} of {total_chunks} chunks."
             )
         except Exception as e:
             log.error(
-                f"Indexer: Error adding/updating document chunk ID {doc.document_id} (file: {doc.file_path}): {e}",
+                f"Indexer: Error updating document chunks for file '{file_path}': {e}",
                 exc_info=True,
             )
-            # Depending on requirements, might raise this error or log and continue.
+            raise
+        finally:
+            # Some of the steps may have been applied even if a later one failed
+            self.invalidate_search_cache()
 
     async def remove_document(self, file_path: str) -> bool:
         """
@@ -367,10 +1079,13 @@ class Indexer:
             True if the delete operation was successful, False otherwise.
         """
         if not self.table:
-            log.warning("Indexer: Table not initialized. Cannot remove document chunks.")
+            log.warning(
+                "Indexer: Table not initialized. Cannot remove document chunks."
+            )
             return False
+        await self.flush()
 
-        delete_condition = f"file_path = '{file_path}'"
+        delete_condition = _sql_equals("file_path", file_path)
         max_retries = 5
         base_delay = 0.1  # seconds
 
@@ -382,7 +1097,8 @@ class Indexer:
                     f"Indexer: Attempt {attempt + 1}/{max_retries} to delete chunks for file: '{file_path}'"
                 )
                 await self.table.delete(delete_condition)
-                log.info(
+                self.invalidate_search_cache()
+                log.debug(
                     f"Indexer: Successfully deleted document chunks for file_path '{file_path}'."
                 )
                 return True  # Success, exit the function
@@ -438,43 +1154,44 @@ class Indexer:
                 "Indexer: Cannot perform search because the table is not initialized."
             )
             raise ValueError("Search failed: Index table not available.")
+        await self._flush_before_read()
         if not query_text:
             log.warning(
                 "Indexer: Received empty query text for search. Returning no results."
             )
             return []
 
+        index_version = self._index_version
+        cache_key = (index_version, query_text, top_k)
+        cached_results = self._search_cache.get(cache_key)
+        if cached_results is not None:
+            log.debug(
+                f"Indexer: Serving cached results for query: '{query_text[:70]}...', top_k={top_k}"
+            )
+            return list(cached_results)
+
         try:
             log.info(
                 f"Indexer: Performing search for query: '{query_text[:70]}...', top_k={top_k}"
             )
-            query_embedding = self.generate_embedding(query_text)
-
-            # Perform the search against the 'vector' column.
-            # self.table.search() is an async method and returns an AsyncVectorQuery object.
-            # .limit() can be chained on the AsyncVectorQuery object.
-            # .to_arrow() is an async method on AsyncVectorQuery that returns a pyarrow.Table.
-            async_search_obj = await self.table.search(
-                query_embedding
-            )  # This is an AsyncVectorQuery
-            query_builder = async_search_obj.limit(top_k)
-            arrow_table = await query_builder.to_arrow()
-            dict_results = arrow_table.to_pylist()
-            # Manually convert dicts to Pydantic models
-            pydantic_results: List[IndexedDocument] = [
-                IndexedDocument(**row) for row in dict_results
-            ]
+            query_embedding = (await self._embed_queries([query_text]))[0]
+            similar_results = self._semantic_search_cache.get(query_embedding, top_k)
+            if similar_results is not None:
+                log.debug(
+                    f"Indexer: Serving cached results of a near-identical query for: '{query_text[:70]}...', top_k={top_k}"
+                )
+                self._search_cache.put(cache_key, similar_results)
+                return list(similar_results)
 
-            # Convert Pydantic models to the SearchResultDict typed dictionary.
-            # Exclude 'vector' from the final result as it's large and usually not needed by clients.
-            typed_results: List[SearchResultDict] = [
-                r.dict(exclude={"vector"})
-                for r in pydantic_results  # Use .dict(exclude=...) for Pydantic V1
-            ]
+            typed_results = (await self._nearest_chunks([query_embedding], top_k))[0]
             log.info(
                 f"Indexer: Search for '{query_text[:70]}...' returned {len(typed_results)} results."
             )
-            return typed_results
+            self._search_cache.put(cache_key, typed_results)
+            self._semantic_search_cache.put(
+                index_version, query_embedding, top_k, typed_results
+            )
+            return list(typed_results)
         except Exception as e:
             log.error(
                 f"Indexer: Search failed for query '{query_text[:70]}...': {e}",
@@ -483,14 +1200,129 @@ class Indexer:
             # Re-raise as a ValueError to indicate a problem with the search operation itself.
             raise ValueError(f"Search operation failed: {str(e)}")
 
+    async def search_batch(
+        self, query_texts: List[str], top_k: int = 5
+    ) -> List[List[SearchResultDict]]:
+        """
+        Performs `search` for several queries at once. Queries that miss the search
+        caches are embedded in a single model call and looked up with a single
+        multi-vector LanceDB query, instead of one round trip each.
+
+        Args:
+            query_texts: The texts to search for.
+            top_k: The number of top results to return per query.
+
+        Returns:
+            One list of `SearchResultDict` objects per query, in query order.
+            Empty queries get an empty list.
+
+        Raises:
+            ValueError: If the search operation fails.
+        """
+        if not self.table:
+            log.error(
+                "Indexer: Cannot perform batch search because the table is not initialized."
+            )
+            raise ValueError("Search failed: Index table not available.")
+        await self._flush_before_read()
+
+        index_version = self._index_version
+        results: List[Optional[List[SearchResultDict]]] = [None] * len(query_texts)
+        missed: List[int] = []  # Positions of queries not served by the exact cache
+        for position, query_text in enumerate(query_texts):
+            if not query_text:
+                results[position] = []
+                continue
+            cached_results = self._search_cache.get((index_version, query_text, top_k))
+            if cached_results is not None:
+                results[position] = list(cached_results)
+            else:
+                missed.append(position)
+
+        if missed:
+            try:
+                log.info(
+                    f"Indexer: Performing batch search for {len(missed)} of {len(query_texts)} queries, top_k={top_k}"
+                )
+                query_embeddings = await self._embed_queries(
+                    [query_texts[p] for p in missed]
+                )
+                to_search: List[Tuple[int, np.ndarray]] = []
+                for position, query_embedding in zip(missed, query_embeddings):
+                    similar_results = self._semantic_search_cache.get(
+                        query_embedding, top_k
+                    )
+                    if similar_results is not None:
+                        self._search_cache.put(
+                            (index_version, query_texts[position], top_k),
+                            similar_results,
+                        )
+                        results[position] = list(similar_results)
+                    else:
+                        to_search.append((position, query_embedding))
+                if to_search:
+                    found = await self._nearest_chunks([e for _, e in to_search], top_k)
+                    for (position, query_embedding), typed_results in zip(
+                        to_search, found
+                    ):
+                        self._search_cache.put(
+                            (index_version, query_texts[position], top_k), typed_results
+                        )
+                        self._semantic_search_cache.put(
+                            index_version, query_embedding, top_k, typed_results
+                        )
+                        results[position] = list(typed_results)
+            except Exception as e:
+                log.error(f"Indexer: Batch search failed: {e}", exc_info=True)
+                raise ValueError(f"Search operation failed: {str(e)}")
+        return results
+
+    async def _nearest_chunks(
+        self, query_embeddings: List[np.ndarray], top_k: int
+    ) -> List[List[SearchResultDict]]:
+        """
+        Runs one LanceDB vector query for all `query_embeddings` and returns the
+        top_k rows nearest to each, in query order. Several query vectors share a
+        single table scan (or index probe).
+        """
+        # A single vector is passed as is: a list of vectors makes it a multi-query
+        query = query_embeddings[0] if len(query_embeddings) == 1 else query_embeddings
+        async_search_obj = await self.table.search(query)  # This is an AsyncVectorQuery
+        # Only the result columns are read, so the 'vector' column of each hit
+        # is never copied out of LanceDB. '_distance' is named explicitly
+        # because lance returns it for vector searches either way.
+        query_builder = (
+            async_search_obj.distance_type(DISTANCE_TYPE)
+            .select(SEARCH_RESULT_COLUMNS + ["_distance"])
+            .limit(top_k)
+        )
+        arrow_table = await query_builder.to_arrow()
+        # Rows come from our own table, so they are converted straight to
+        # SearchResultDicts, without a validating IndexedDocument round trip.
+        # '_distance' is left out: clients do not need it.
+        rows: List[SearchResultDict] = arrow_table.select(
+            SEARCH_RESULT_COLUMNS
+        ).to_pylist()
+        if len(query_embeddings) == 1:
+            return [rows]
+        # Multi-vector queries add a 'query_index' column naming each row's query
+        grouped: List[List[SearchResultDict]] = [[] for _ in query_embeddings]
+        for query_index, row in zip(
+            arrow_table.column("query_index").to_pylist(), rows
+        ):
+            grouped[query_index].append(row)
+        return grouped
+
     async def get_indexed_chunk_count(self, project_path: Optional[str] = None) -> int:
         """
         Counts the number of indexed chunks. If `project_path` is provided,
-        it counts chunks associated with that specific project path prefix.
-        Otherwise, it counts all chunks in the table.
+        it counts chunks associated with that project.
+        Otherwise, it counts all chunks in the table plus those waiting in the
+        write buffer, without flushing it: status polling during a scan must not
+        break up the buffer's bulk writes.
 
         Args:
-            project_path: Optional. The project path prefix to filter by.
+            project_path: Optional. The project path to filter by.
 
         Returns:
             The number of (matching) indexed chunks.
@@ -500,28 +1332,31 @@ class Indexer:
             return 0
 
         filter_clause = None
+        pending_rows = 0
         if project_path:
-            # Basic sanitization for the LIKE pattern.
-            # This is a simple measure; for complex user inputs, more robust sanitization might be needed.
-            safe_project_path_segment = (
-                project_path.replace("'", "''").replace("%", "\\%").replace("_", "\\_")
-            )
-            filter_clause = f"file_path LIKE '{safe_project_path_segment}%'"
+            await self._flush_before_read()
+            filter_clause = _sql_equals("project_path", project_path)
             log.debug(f'Indexer: Counting chunks with filter: "{filter_clause}"')
         else:
+            pending_rows = self._write_buffer.num_rows
             log.debug("Indexer: Counting all chunks in the table.")
 
         try:
-            count = await self.table.count_rows(
-                filter_clause
-            )  # filter_clause can be None for no filter
-            log.info(
+            # Read the version before counting: a write finishing meanwhile
+            # bumps it, so the stored count is never served
+            index_version = self._index_version
+            cached = self._count_cache.get(filter_clause or "")
+            if cached and cached[0] == index_version:
+                table_count = cached[1]
+            else:
+                table_count = await self.table.count_rows(
+                    filter_clause
+                )  # filter_clause can be None for no filter
+                self._count_cache[filter_clause or ""] = (index_version, table_count)
+            count = table_count + pending_rows
+            log.debug(
                 f"Indexer: Found {count} indexed chunks"
-                + (
-                    f" for project path prefix '{project_path}'."
-                    if project_path
-                    else "."
-                )
+                + (f" for project path '{project_path}'." if project_path else ".")
             )
             return count
         except Exception as e:
@@ -533,36 +1368,37 @@ class Indexer:
             )
             return 0  # Return 0 on error to avoid breaking callers expecting an int.
 
-    def clear_index(self, project_path: Optional[str] = None):
+    async def clear_index(self, project_path: Optional[str] = None):
         """
         Removes document chunks from the index. If `project_path` is provided,
-        only chunks associated with that project path prefix are removed.
+        only chunks indexed for that project are removed.
         Otherwise, ALL chunks in the table are removed (effectively clearing the entire table content).
 
         Args:
-            project_path: Optional. The project path prefix for targeted deletion.
+            project_path: Optional. The project path for targeted deletion.
                           If None, all documents are deleted.
         """
         if not self.table:
             log.warning("Indexer: Table not initialized. Cannot clear index.")
             return
+        await self.flush()
 
         where_clause = None
         log_message_segment = "all documents"
         if project_path:
-            safe_project_path_segment = (
-                project_path.replace("'", "''").replace("%", "\\%").replace("_", "\\_")
-            )
-            where_clause = f"file_path LIKE '{safe_project_path_segment}%'"
-            log_message_segment = f"documents for project path prefix '{project_path}'"
+            where_clause = _sql_equals("project_path", project_path)
+            log_message_segment = f"documents for project path '{project_path}'"
 
         try:
-            count_before = self.table.count_rows(where_clause)
+            count_before = await self.table.count_rows(where_clause)
             if count_before > 0:
                 log.info(
                     f'Indexer: Attempting to delete {count_before} chunks from {log_message_segment} (filter: "{where_clause}").'
                 )
-                self.table.delete(where_clause)  # delete() returns None on success
+                await self.table.delete(
+                    where_clause if where_clause else "true"
+                )  # delete() returns None on success
+                self.invalidate_search_cache()
                 # Verify deletion if possible, or assume success if no exception.
                 log.info(
                     f"Indexer: Successfully issued delete command for {count_before} chunks from {log_message_segment}."
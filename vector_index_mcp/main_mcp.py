@@ -1,14 +1,16 @@
-import json
 import logging
 import sys
 from contextlib import asynccontextmanager
 
+import orjson
 from mcp.server.fastmcp import FastMCP
 
+from vector_index_mcp.config import get_vector_index_settings
 from vector_index_mcp.mcp_server import MCPServer
 
 logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+    level=get_vector_index_settings().log_level,
+    format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
 )
 log = logging.getLogger(__name__)
 
@@ -50,6 +52,20 @@ mcp = FastMCP(
 )  # Updated version slightly
 
 
+def _get_mcp_server(tool_name: str) -> MCPServer:
+    """Returns the MCPServer created by the lifespan, raising if there is none yet."""
+    mcp_server = mcp.mcp_server  # Access mcp_server directly from mcp
+    if not mcp_server:
+        log.error(f"{tool_name}: MCPServer is not initialized.")
+        raise RuntimeError("MCPServer is not initialized.")
+    return mcp_server
+
+
+def _text_result(text: str, is_error: bool = False) -> dict:
+    """Builds the single-text-content result every tool returns."""
+    return {"content": [{"type": "text", "text": text}], "isError": is_error}
+
+
 @mcp.tool(
     name="trigger_index",
     description="Triggers the process of scanning project files, extracting text, and storing it in a vector index for subsequent searching. Use this tool after making significant changes to the project or for initial setup. The `force_reindex` parameter will first delete the existing index, which is useful if files have been deleted or the configuration has changed.",
@@ -59,29 +75,20 @@ async def trigger_index_tool(force_reindex: bool = False) -> dict:
     MCP tool to trigger the indexing or re-indexing of project files.
     """
     try:
-        mcp_server = mcp.mcp_server  # Access mcp_server directly from mcp
-        if not mcp_server:
-            log.error("trigger_index_tool: MCPServer is not initialized.")
-            raise RuntimeError("MCPServer is not initialized.")
+        mcp_server = _get_mcp_server("trigger_index_tool")
         # _scan_project_files expects project_path, which is part of mcp_server instance
         log.info(
             f"trigger_index_tool: Triggering scan with force_reindex={force_reindex}"
         )
+        # A scan requested during the startup scan runs after it instead of being rejected
+        await mcp_server.wait_for_initial_scan()
         await mcp_server._scan_project_files(
             project_path=mcp_server.project_path, force_reindex=force_reindex
         )
-        return {
-            "content": [{"type": "text", "text": "Indexing successfully triggered."}],
-            "isError": False,
-        }
+        return _text_result("Indexing successfully triggered.")
     except Exception as e:
         log.error(f"Error in trigger_index_tool: {e}", exc_info=True)
-        return {
-            "content": [
-                {"type": "text", "text": f"Error triggering indexing: {str(e)}"}
-            ],
-            "isError": True,
-        }
+        return _text_result(f"Error triggering indexing: {str(e)}", is_error=True)
 
 
 @mcp.tool(
@@ -93,22 +100,13 @@ async def get_status_tool() -> dict:
     MCP tool to retrieve the current status of the server and indexer.
     """
     try:
-        mcp_server = mcp.mcp_server  # Access mcp_server directly from mcp
-        if not mcp_server:
-            log.error("get_status_tool: MCPServer is not initialized.")
-            raise RuntimeError("MCPServer is not initialized.")
+        mcp_server = _get_mcp_server("get_status_tool")
         log.debug("get_status_tool: Fetching current status.")
         status_data = await mcp_server.get_current_status()
-        return {
-            "content": [{"type": "text", "text": json.dumps(status_data)}],
-            "isError": False,
-        }
+        return _text_result(orjson.dumps(status_data).decode())
     except Exception as e:
         log.error(f"Error in get_status_tool: {e}", exc_info=True)
-        return {
-            "content": [{"type": "text", "text": f"Error getting status: {str(e)}"}],
-            "isError": True,
-        }
+        return _text_result(f"Error getting status: {str(e)}", is_error=True)
 
 
 @mcp.tool(
@@ -120,24 +118,38 @@ async def search_index_tool(query: str, top_k: int = 5) -> dict:
     MCP tool to perform a search in the vector index.
     """
     try:
-        mcp_server = mcp.mcp_server  # Access mcp_server directly from mcp
-        if not mcp_server:
-            log.error("search_index_tool: MCPServer is not initialized.")
-            raise RuntimeError("MCPServer is not initialized.")
+        mcp_server = _get_mcp_server("search_index_tool")
         log.info(
             f"search_index_tool: Performing search for query='{query}', top_k={top_k}"
         )
         results = await mcp_server.perform_search(query_text=query, top_k=top_k)
-        return {
-            "content": [{"type": "text", "text": json.dumps(results)}],
-            "isError": False,
-        }
+        return _text_result(orjson.dumps(results).decode())
+    except Exception as e:
+        # perform_search logged the failure's traceback, if it had an unexpected one
+        log.error(f"Error in search_index_tool: {e}")
+        return _text_result(f"Error performing search: {str(e)}", is_error=True)
+
+
+@mcp.tool(
+    name="search_index_batch",
+    description="Performs the semantic search of `search_index` for several queries in one call, e.g. to gather context on multiple topics at once. Returns one list of the `top_k` most relevant text chunks per query, in the order of `queries`. Faster than calling `search_index` once per query, since the queries are embedded and looked up together.",
+)
+async def search_index_batch_tool(queries: list[str], top_k: int = 5) -> dict:
+    """
+    MCP tool to perform several searches in the vector index at once.
+    """
+    try:
+        mcp_server = _get_mcp_server("search_index_batch_tool")
+        log.info(
+            f"search_index_batch_tool: Performing search for {len(queries)} queries, top_k={top_k}"
+        )
+        results = await mcp_server.perform_search_batch(
+            query_texts=queries, top_k=top_k
+        )
+        return _text_result(orjson.dumps(results).decode())
     except Exception as e:
-        log.error(f"Error in search_index_tool: {e}", exc_info=True)
-        return {
-            "content": [{"type": "text", "text": f"Error performing search: {str(e)}"}],
-            "isError": True,
-        }
+        log.error(f"Error in search_index_batch_tool: {e}")
+        return _text_result(f"Error performing search: {str(e)}", is_error=True)
 
 
 def main():
@@ -149,7 +161,10 @@ def main():
         log.critical(
             "Error: Project path not specified."
         )  # Changed to critical as it prevents server start
-        print("Usage: python -m vector_index_mcp.main_mcp <project_path>")
+        print(
+            "Usage: python -m vector_index_mcp.main_mcp <project_path>",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
     project_path = sys.argv[1]
@@ -3,6 +3,7 @@ import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
 from typing import Any, Optional
 
@@ -12,6 +13,9 @@ from .models import Settings
 
 log = logging.getLogger(__name__)
 
+# Seconds a status request waits for the chunk count before reporting the last known one
+STATUS_COUNT_TIMEOUT = 2.0
+
 
 class ServerStatus(Enum):
     """Represents the initialization status of the server."""
@@ -23,6 +27,12 @@ class ServerStatus(Enum):
     ERROR = auto()  # Server encountered an unrecoverable error during init
 
 
+# Statuses in which searches run without a warning (results may be partial while SCANNING)
+SEARCHABLE_STATUSES = frozenset(
+    {ServerStatus.WATCHING, ServerStatus.READY, ServerStatus.SCANNING}
+)
+
+
 class MCPServer:
     """Core class managing indexing state, file watching, and scanning logic."""
 
@@ -58,11 +68,36 @@ class MCPServer:
                 self.settings.ignore_patterns
             ),  # Pass original patterns from settings
             abs_lancedb_path_to_ignore=self.abs_lancedb_path,
+            scan_workers=self.settings.scan_workers,
+            debounce_period=self.settings.debounce_period,
+            fast_hash_large_files=self.settings.fast_hash_large_files,
+            fast_hash_threshold=self.settings.fast_hash_threshold,
+            observer_backend=self.settings.watcher_backend,
+            polling_interval=self.settings.polling_interval,
         )
         self.last_scan_start_time: Optional[float] = None
         self.last_scan_end_time: Optional[float] = None
         self.current_error: Optional[str] = None
         self.watcher_thread = None
+        # Reported when counting chunks takes longer than STATUS_COUNT_TIMEOUT
+        self._last_chunk_count: Optional[int] = None
+        # Held only while the status fields are read or updated together, never
+        # across I/O, so status reads never wait for a scan
+        self._state_lock = threading.RLock()
+        # Serializes initialization, so a repeated call cannot load the model twice
+        self._init_lock = asyncio.Lock()
+        # Held for the duration of a scan; a second scan is rejected instead of
+        # running concurrently and writing to the same table
+        self._scan_lock = asyncio.Lock()
+        # Scans run on their own thread rather than the loop's default executor, so a
+        # long scan never holds a thread that other to_thread calls need
+        self._scan_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="project-scan"
+        )
+        # Guards the check-and-start of the watcher thread
+        self._watcher_thread_lock = threading.Lock()
+        # Background task running the startup scan (see _run_initial_scan)
+        self._initial_scan_task: Optional[asyncio.Task] = None
 
         log.info(f"Monitoring project path: {self.project_path}")
 
@@ -72,11 +107,23 @@ class MCPServer:
         and sets the server status accordingly. Starts the file watcher thread
         upon successful initialization.
         """
+        if self.indexer is not None:
+            return
+        async with self._init_lock:
+            if self.indexer is not None:  # Initialized while waiting for the lock
+                return
+            await self._initialize_dependencies_locked()
+
+    async def _initialize_dependencies_locked(self):
+        """Body of _initialize_dependencies; runs with `_init_lock` held."""
         log.info("Starting MCPServer dependencies initialization...")
         try:
             indexer = Indexer(self.settings)
 
             await indexer.load_resources()  # Load any async resources for the indexer
+            if indexer.table_was_created:
+                # A fresh table holds none of the files recorded by a previous run
+                self.file_watcher.reset_known_files()
 
             self.indexer = indexer
             self.file_watcher.indexer = self.indexer  # Provide the initialized indexer
@@ -94,24 +141,11 @@ class MCPServer:
                 )
                 # Depending on strictness, could raise here or allow FileWatcher to operate in a limited mode / log errors later.
 
-            # Automatically trigger an initial scan of project files on startup
-            log.info("Triggering initial project file scan on server startup...")
-            await self._scan_project_files(self.project_path, False)
-
+            # The initial scan runs in the background, so requests (e.g. status) are
+            # served while it indexes the project
+            self._initial_scan_task = asyncio.create_task(self._run_initial_scan())
             log.debug(
-                "MCPServer._initialize_dependencies: Indexer and FileWatcher configured. About to set status to READY."
-            )
-            self.status = ServerStatus.READY
-            log.info(
-                "MCPServer dependencies initialized successfully. Server is READY."
-            )
-            log.debug(
-                "MCPServer._initialize_dependencies: Status set to READY. About to start watcher thread."
-            )
-            # _start_watcher_thread is a synchronous method that starts a new thread.
-            self._start_watcher_thread()
-            log.debug(
-                "MCPServer._initialize_dependencies: Watcher thread start initiated."
+                "MCPServer._initialize_dependencies: Indexer and FileWatcher configured. Initial scan started."
             )
 
         except Exception as e:
@@ -122,23 +156,53 @@ class MCPServer:
             self.initialization_error = e
             self.status = ServerStatus.ERROR
 
+    async def _run_initial_scan(self):
+        """
+        Scans the project after startup, then starts the file watcher thread.
+        Runs as a background task created by _initialize_dependencies; a failed
+        scan is recorded as an initialization error.
+        """
+        log.info("Triggering initial project file scan on server startup...")
+        try:
+            await self._scan_project_files(self.project_path, False)
+        except Exception as e:
+            log.critical(f"Initial project scan failed: {e}", exc_info=True)
+            with self._state_lock:
+                self.initialization_error = e
+                self.status = ServerStatus.ERROR
+            return
+
+        with self._state_lock:
+            self.status = ServerStatus.READY
+        log.info("MCPServer dependencies initialized successfully. Server is READY.")
+        # _start_watcher_thread is a synchronous method that starts a new thread.
+        self._start_watcher_thread()
+
+    async def wait_for_initial_scan(self):
+        """Waits until the initial scan started by _initialize_dependencies has finished."""
+        task = self._initial_scan_task
+        if task is not None and not task.done():
+            # Shielded: a cancelled caller must not cancel the scan
+            await asyncio.shield(task)
+
     def _start_watcher_thread(self):
         """
         Starts the file watcher in a separate daemon thread.
         Logs a warning if the thread is already running.
         """
-        if self.watcher_thread is not None and self.watcher_thread.is_alive():
-            log.warning(
-                "Attempted to start file watcher thread, but it is already running."
-            )
-            return
+        with self._watcher_thread_lock:
+            if self.watcher_thread is not None and self.watcher_thread.is_alive():
+                log.warning(
+                    "Attempted to start file watcher thread, but it is already running."
+                )
+                return
 
-        log.info("Starting file watcher thread...")
-        self.watcher_thread = threading.Thread(
-            target=self.file_watcher.start,  # The method to be executed in the new thread
-            daemon=True,  # Ensures thread exits when the main program exits
-        )
-        self.watcher_thread.start()
+            log.info("Starting file watcher thread...")
+            self.watcher_thread = threading.Thread(
+                target=self.file_watcher.start,  # The method to be executed in the new thread
+                daemon=True,  # Ensures thread exits when the main program exits
+            )
+            self.watcher_thread.start()
         self.status = ServerStatus.WATCHING  # Update server status
         log.info(
             "File watcher thread started. Server is now WATCHING. "
@@ -167,49 +231,61 @@ class MCPServer:
             self.current_error = f"Scan requested for unsupported path: {project_path}"
             raise ValueError(f"Scan requested for unsupported path: {project_path}")
 
-        if self.status == ServerStatus.SCANNING:
+        if self._scan_lock.locked():
             log.warning("Scan request ignored: another scan is already in progress.")
             raise RuntimeError(
                 "Scan request ignored: another scan is already in progress."
             )
+        async with self._scan_lock:
+            await self._run_scan(project_path, force_reindex)
 
+    async def _run_scan(self, project_path: str, force_reindex: bool):
+        """Body of _scan_project_files; runs with `_scan_lock` held."""
         log.info(
             f"Starting project file scan for '{project_path}'. force_reindex={force_reindex}"
         )
-        self.status = ServerStatus.SCANNING
-        self.last_scan_start_time = time.time()
-        self.last_scan_end_time = None
-        self.current_error = None  # Clear previous errors before a new scan
+        with self._state_lock:
+            self.status = ServerStatus.SCANNING
+            self.last_scan_start_time = time.time()
+            self.last_scan_end_time = None
+            self.current_error = None  # Clear previous errors before a new scan
+        loop = asyncio.get_running_loop()
         try:
             if force_reindex:
                 log.info(
                     f"Force re-index: Clearing existing index for '{project_path}'..."
                 )
-                await asyncio.to_thread(
-                    self.indexer.clear_index, project_path
-                )  # Ensure clear_index is thread-safe
+                # Let queued indexing jobs land first, so none re-adds rows after the clear
+                await loop.run_in_executor(
+                    self._scan_executor, self.file_watcher.wait_for_indexing
+                )
+                await self.indexer.clear_index(project_path)
+                self.file_watcher.reset_known_files()
                 log.info(f"Index successfully cleared for '{project_path}'.")
 
             log.info(f"Running file system scan and indexing for '{project_path}'...")
-            await asyncio.to_thread(
-                self.file_watcher.initial_scan
+            await loop.run_in_executor(
+                self._scan_executor, self.file_watcher.initial_scan
             )  # initial_scan should handle its own detailed file logging
-            self.last_scan_end_time = time.time()
-            duration = self.last_scan_end_time - self.last_scan_start_time
-            self.status = (
-                ServerStatus.WATCHING
-            )  # After scan, server returns to watching state
+            await self.indexer.optimize_indices()
+            with self._state_lock:
+                self.last_scan_end_time = time.time()
+                duration = self.last_scan_end_time - self.last_scan_start_time
+                self.status = (
+                    ServerStatus.WATCHING
+                )  # After scan, server returns to watching state
             log.info(
                 f"Project file scan completed for '{project_path}' in {duration:.2f} seconds. Server is now WATCHING."
             )
             # The calling tool is responsible for returning a success message to the user.
 
         except Exception as e:
-            self.status = (
-                ServerStatus.ERROR
-            )  # If scan fails, server is in an error state regarding indexing
-            self.current_error = f"Indexing scan failed: {str(e)}"
-            self.last_scan_end_time = time.time()
+            with self._state_lock:
+                self.status = (
+                    ServerStatus.ERROR
+                )  # If scan fails, server is in an error state regarding indexing
+                self.current_error = f"Indexing scan failed: {str(e)}"
+                self.last_scan_end_time = time.time()
             log.error(
                 f"Critical error during file scan for '{project_path}': {e}",
                 exc_info=True,
@@ -221,6 +297,9 @@ class MCPServer:
         Gracefully shuts down the MCPServer, stopping the file watcher and joining its thread.
         """
         log.info("MCPServer shutdown process initiated...")
+        if self._initial_scan_task is not None and not self._initial_scan_task.done():
+            # Stopping the file watcher below makes the scan skip its remaining files
+            self._initial_scan_task.cancel()
         if self.file_watcher:
             log.info("Stopping file watcher...")
             await asyncio.to_thread(self.file_watcher.stop)
@@ -234,37 +313,68 @@ class MCPServer:
                 log.warning("File watcher thread did not exit cleanly after timeout.")
             else:
                 log.info("File watcher thread successfully joined.")
+        self._scan_executor.shutdown(wait=False)
+        if self.indexer:
+            self.indexer.close()
         log.info("MCPServer shutdown complete.")
 
+    def snapshot_state(self) -> dict[str, Any]:
+        """
+        Returns a consistent copy of the server's status fields, taken under
+        `_state_lock`. Callers build their responses from the copy without
+        holding the lock.
+        """
+        with self._state_lock:
+            error_message_to_report = None
+            if self.current_error:
+                error_message_to_report = self.current_error
+            elif self.initialization_error:  # Fall back to the initialization error
+                error_message_to_report = (
+                    f"Initialization Error: {str(self.initialization_error)}"
+                )
+            return {
+                "project_path": self.project_path,
+                "status": self.status.name,
+                "last_scan_start_time": self.last_scan_start_time,
+                "last_scan_end_time": self.last_scan_end_time,
+                "error_message": error_message_to_report,
+            }
+
     async def get_current_status(self) -> dict[str, Any]:
         """
         Collects and returns the current operational status of the MCPServer,
         including project path, server status, scan times, and index statistics.
+        The status fields come from `snapshot_state`; the chunk count is read
+        from the index without holding any lock. If counting takes longer than
+        STATUS_COUNT_TIMEOUT (e.g. while a scan is writing), the last known count
+        is reported instead, so status requests stay fast.
         """
         log.debug("Fetching current server status...")
+        status_payload = self.snapshot_state()
         indexed_chunk_count = None
         if self.indexer:
             try:
-                indexed_chunk_count = await self.indexer.get_indexed_chunk_count()
+                indexed_chunk_count = await asyncio.wait_for(
+                    self.indexer.get_indexed_chunk_count(), STATUS_COUNT_TIMEOUT
+                )
+                self._last_chunk_count = indexed_chunk_count
+            except asyncio.TimeoutError:
+                log.warning(
+                    f"Counting indexed chunks timed out after {STATUS_COUNT_TIMEOUT}s; reporting the last known count."
+                )
+                indexed_chunk_count = self._last_chunk_count
             except Exception as e:
                 log.error(f"Failed to retrieve indexed chunk count: {e}", exc_info=True)
-
-        error_message_to_report = None
-        if self.current_error:
-            error_message_to_report = self.current_error
-        elif self.initialization_error:  # Fallback to initialization error if present
-            error_message_to_report = (
-                f"Initialization Error: {str(self.initialization_error)}"
-            )
-
-        status_payload = {
-            "project_path": self.project_path,
-            "status": self.status.name,
-            "last_scan_start_time": self.last_scan_start_time,
-            "last_scan_end_time": self.last_scan_end_time,
-            "indexed_chunk_count": indexed_chunk_count,
-            "error_message": error_message_to_report,
-        }
+        status_payload["indexed_chunk_count"] = indexed_chunk_count
+        if self.indexer:
+            status_payload["query_embedding_cache"] = {
+                "hits": self.indexer.query_embedding_cache_hits,
+                "misses": self.indexer.query_embedding_cache_misses,
+            }
+        # Progress of the running (or last) startup scan; updated without locking
+        status_payload["files_scanned"] = (
+            self.file_watcher.files_scanned if self.file_watcher else None
+        )
         log.debug(f"Current server status: {status_payload}")
         return status_payload
 
@@ -282,23 +392,7 @@ class MCPServer:
         Raises:
             RuntimeError: If the indexer is not available or if the search operation fails.
         """
-        if not self.indexer:
-            log.error("Search request failed: Indexer is not available.")
-            raise RuntimeError(
-                "Indexer not available. Please initialize the server or check its status."
-            )
-
-        # READY is an alias for WATCHING. Allow search if watching or ready.
-        if self.status not in [
-            ServerStatus.WATCHING,
-            ServerStatus.READY,
-            ServerStatus.SCANNING,
-        ]:  # Allow search even if scanning, though results might be partial
-            log.warning(
-                f"Performing search while server status is '{self.status.name}'. Results may be incomplete or reflect ongoing indexing."
-            )
-            # No error raised, allow search but warn.
-
+        self._check_search_available()
         try:
             log.info(f"Performing search for query: '{query_text}', top_k={top_k}")
             # self.indexer.search is now an async method
@@ -306,8 +400,57 @@ class MCPServer:
             log.info(f"Search for '{query_text}' returned {len(results)} results.")
             return results
         except Exception as e:
+            # The indexer raises ValueError for search failures and has already
+            # logged their traceback; only unexpected errors get one here
             log.error(
                 f"Error during search operation for query '{query_text}': {e}",
-                exc_info=True,
+                exc_info=not isinstance(e, ValueError),
+            )
+            raise RuntimeError(f"Search failed: {str(e)}")
+
+    async def perform_search_batch(
+        self, query_texts: list[str], top_k: int
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Performs several search queries against the vector index in one indexer call.
+
+        Args:
+            query_texts: The texts to search for.
+            top_k: The maximum number of results to return per query.
+
+        Returns:
+            One list of search results per query, in query order.
+
+        Raises:
+            RuntimeError: If the indexer is not available or if the search operation fails.
+        """
+        self._check_search_available()
+        try:
+            log.info(
+                f"Performing batch search for {len(query_texts)} queries, top_k={top_k}"
+            )
+            return await self.indexer.search_batch(query_texts=query_texts, top_k=top_k)
+        except Exception as e:
+            log.error(
+                f"Error during batch search operation: {e}",
+                exc_info=not isinstance(e, ValueError),
             )
             raise RuntimeError(f"Search failed: {str(e)}")
+
+    def _check_search_available(self):
+        """
+        Raises RuntimeError if there is no indexer to search, and warns if the index
+        may still be incomplete.
+        """
+        if not self.indexer:
+            log.error("Search request failed: Indexer is not available.")
+            raise RuntimeError(
+                "Indexer not available. Please initialize the server or check its status."
+            )
+
+        # READY is an alias for WATCHING. Allow search if watching or ready.
+        if self.status not in SEARCHABLE_STATUSES:
+            log.warning(
+                f"Performing search while server status is '{self.status.name}'. Results may be incomplete or reflect ongoing indexing."
+            )
+            # No error raised, allow search but warn.
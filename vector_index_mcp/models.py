@@ -1,10 +1,10 @@
-import os
 from typing import List, Optional
 
+import pyarrow as pa
 from lancedb.pydantic import LanceModel, Vector
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field
 
-from .config import get_vector_index_settings
+from .config import Settings, get_vector_index_settings  # noqa: F401 (re-exported)
 
 settings = get_vector_index_settings()
 EMBEDDING_DIM = settings.embedding_dim
@@ -17,56 +17,20 @@ class FileMetadata(LanceModel):
 class IndexedDocument(LanceModel):
     document_id: str
     file_path: str
+    # Root of the project the file belongs to; scalar-indexed, so per-project
+    # counts and deletes are equality lookups instead of file_path prefix scans
+    project_path: str
     content_hash: str
     last_modified_timestamp: float
     chunk_index: int
     total_chunks: int
     extracted_text_chunk: str
     metadata: FileMetadata
-    vector: Optional[Vector(dim=EMBEDDING_DIM)] = Field(default=None)
-
-
-class Settings(
-    BaseModel
-):  # Settings should be a standard Pydantic model, not a LanceModel for DB table
-    """
-    Configuration settings for the vector index MCP server, typically loaded from
-    environment variables or a configuration file.
-    """
-
-    embedding_model_name: str = Field(
-        default_factory=lambda: os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2"),
-        description="Name of the sentence-transformer model to use for embeddings.",
-    )
-    lancedb_uri: str = Field(
-        default_factory=lambda: os.getenv("LANCEDB_URI", "./.lancedb"),
-        description="URI for the LanceDB database. Can be a local path or remote.",
-    )
-    log_level: str = Field(
-        default_factory=lambda: os.getenv("LOG_LEVEL", "INFO").upper(),
-        description="Logging level for the application (e.g., DEBUG, INFO, WARNING, ERROR).",
-    )
-    project_path: str  # This is a required field, typically passed as a CLI argument.
-    ignore_patterns: List[str] = Field(
-        default_factory=lambda: [
-            p.strip()
-            for p in os.getenv(
-                "IGNORE_PATTERNS",
-                ".git,__pycache__,*.pyc,*.DS_Store,.DS_Store",  # Added .DS_Store
-            ).split(",")
-            if p.strip()  # Ensure no empty strings from multiple commas
-        ],
-        description="Comma-separated list of .gitignore-style patterns for files/directories to ignore.",
-    )
-
-    @validator("log_level")
-    def validate_log_level(cls, value):
-        allowed_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if value.upper() not in allowed_levels:
-            raise ValueError(
-                f"Invalid log_level: {value}. Must be one of {allowed_levels}"
-            )
-        return value.upper()
+    # Stored as fp16: the embeddings are L2-normalized and tolerate the reduced
+    # precision, and half the bytes are read per vector scan
+    vector: Optional[Vector(dim=EMBEDDING_DIM, value_type=pa.float16())] = Field(
+        default=None
+    )
 
 
 # --- Models for MCP Tool Arguments and Return Payloads ---
@@ -149,7 +113,7 @@ class SearchResultItem(BaseModel):  # Corrected from LanceModel
         description="Path to the original file from which this chunk was extracted.",
     )
     content_hash: str = Field(
-        ..., description="SHA256 hash of the original file's content when indexed."
+        ..., description="xxh3-128 hash of the original file's content when indexed."
     )
     last_modified_timestamp: float = Field(
         ...,